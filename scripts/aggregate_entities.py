@@ -6,23 +6,43 @@ Output: data/knowledge/entities.json
 """
 from __future__ import annotations
 
-import json
 import logging
+import os
 import re
-from collections import defaultdict
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger("aggregate_entities")
 
+_PAREN_RE = re.compile(r"[（(].+?[）)]")
+_WS_RE = re.compile(r"\s+")
+
+IMPORTANCE_RANK = {"high": 3, "medium": 2, "low": 1}
+
 
+@lru_cache(maxsize=None)
 def normalize_name(name: str) -> str:
-    """Normalize entity name for dedup."""
-    # Remove parenthetical foreign names for matching
-    base = re.sub(r"[（(].+?[）)]", "", name).strip()
-    # Normalize whitespace
-    base = re.sub(r"\s+", "", base)
-    return base
+    """Normalize entity name for dedup (memoized: names repeat across episodes)."""
+    # Remove parenthetical foreign names for matching, then all whitespace
+    return _WS_RE.sub("", _PAREN_RE.sub("", name))
+
+
+def _load_one(path: str) -> dict | None:
+    """Parse one analysis file; None if it was skipped or failed to parse."""
+    with open(path, "rb") as f:
+        data = orjson.loads(f.read())
+    if data.get("skipped") or data.get("parse_error"):
+        return None
+    data.setdefault("episode_id", os.path.basename(path)[:-5])
+    return data
 
 
 def main() -> None:
@@ -30,67 +50,69 @@ def main() -> None:
     output_dir = Path("data/knowledge")
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Collect all entities
-    raw_entities: list[dict] = []
-    episode_count = 0
+    # Collect all entities as (normalized name, episode index, importance rank,
+    # entity); episode metadata is stored once per episode, not on every entity
+    episodes_meta: list[tuple[str, str]] = []
+    raw_entities: list[tuple[str, int, int, dict]] = []
+
+    from src.postprocess.manifest import json_files
+
+    with ProcessPoolExecutor() as ex:
+        datas = list(ex.map(_load_one, json_files(analysis_dir), chunksize=8))
 
-    for f in sorted(analysis_dir.glob("*.json")):
-        with open(f) as fh:
-            data = json.load(fh)
-        if data.get("skipped") or data.get("parse_error"):
+    for data in datas:
+        if data is None:
             continue
-        episode_count += 1
-        episode_id = data.get("episode_id", f.stem)
-        title = data.get("title", "")
+        ep_idx = len(episodes_meta)
+        episodes_meta.append((data["episode_id"], data.get("title", "")))
+        # The LLM sometimes lists an entity twice; keep the first mention
+        seen_in_ep: set[str] = set()
         for ent in data.get("entities", []):
-            ent["_episode_id"] = episode_id
-            ent["_episode_title"] = title
-            raw_entities.append(ent)
+            key = normalize_name(ent.get("name", ""))
+            if not key or key in seen_in_ep:
+                continue
+            seen_in_ep.add(key)
+            rank = IMPORTANCE_RANK.get(ent.get("importance", "low"), 0)
+            raw_entities.append((key, ep_idx, rank, ent))
 
-    logger.info("Loaded %d raw entities from %d episodes", len(raw_entities), episode_count)
+    logger.info("Loaded %d raw entities from %d episodes", len(raw_entities), len(episodes_meta))
 
     # Group by normalized name
-    groups: dict[str, list[dict]] = defaultdict(list)
-    for ent in raw_entities:
-        key = normalize_name(ent.get("name", ""))
-        if key:
-            groups[key].append(ent)
+    groups: dict[str, list[tuple[int, int, dict]]] = defaultdict(list)
+    for key, ep_idx, rank, ent in raw_entities:
+        groups[key].append((ep_idx, rank, ent))
 
     # Build unified entity database
     entities = []
-    for key, group in sorted(groups.items(), key=lambda x: -len(x[1])):
-        # Pick the most common full name (with foreign name if present)
-        name_counts: dict[str, int] = defaultdict(int)
-        for ent in group:
-            name_counts[ent["name"]] += 1
-        canonical_name = max(name_counts, key=name_counts.get)
-
-        # Most common type
-        type_counts: dict[str, int] = defaultdict(int)
-        for ent in group:
-            type_counts[ent.get("type", "other")] += 1
-        canonical_type = max(type_counts, key=type_counts.get)
-
-        # Collect unique episodes
+    mentions: dict[str, int] = {}
+    for key, group in groups.items():
+        # One pass over the group: name/type tallies, unique episodes, top importance
+        name_counts: Counter[str] = Counter()
+        type_counts: Counter[str] = Counter()
         episodes = []
         seen_eps = set()
-        for ent in group:
-            ep_id = ent["_episode_id"]
+        max_rank = -1
+        max_importance = "low"
+        for ep_idx, imp_rank, ent in group:
+            name_counts[ent["name"]] += 1
+            type_counts[ent.get("type", "other")] += 1
+            importance = ent.get("importance", "low")
+            if imp_rank > max_rank:
+                max_rank = imp_rank
+                max_importance = importance
+            ep_id, ep_title = episodes_meta[ep_idx]
             if ep_id not in seen_eps:
                 seen_eps.add(ep_id)
                 episodes.append({
                     "episode_id": ep_id,
-                    "title": ent["_episode_title"],
+                    "title": ep_title,
                     "context": ent.get("context", ""),
-                    "importance": ent.get("importance", "low"),
+                    "importance": importance,
                 })
 
-        # Highest importance across episodes
-        imp_order = {"high": 3, "medium": 2, "low": 1}
-        max_importance = max(
-            (ent.get("importance", "low") for ent in group),
-            key=lambda x: imp_order.get(x, 0),
-        )
+        # Most common full name (with foreign name if present) and type
+        canonical_name = name_counts.most_common(1)[0][0]
+        canonical_type = type_counts.most_common(1)[0][0]
 
         entities.append({
             "name": canonical_name,
@@ -100,14 +122,15 @@ def main() -> None:
             "importance": max_importance,
             "episodes": episodes,
         })
+        mentions[key] = len(group)
 
-    # Sort by episode count (most referenced first)
-    entities.sort(key=lambda x: -x["episode_count"])
+    # Sort by episode count (most referenced first), ties by raw mention count
+    entities.sort(key=lambda x: (-x["episode_count"], -mentions[x["normalized"]]))
 
     # Save
     out_path = output_dir / "entities.json"
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(entities, f, ensure_ascii=False, indent=2)
+    with open(out_path, "wb", buffering=1 << 20) as f:
+        f.write(orjson.dumps(entities, option=orjson.OPT_INDENT_2))
 
     # Stats
     logger.info("Unique entities: %d", len(entities))
@@ -119,7 +142,6 @@ def main() -> None:
         )
 
     # Type distribution
-    from collections import Counter
     type_dist = Counter(e["type"] for e in entities)
     logger.info("Type distribution: %s", dict(type_dist.most_common()))
 
@@ -5,29 +5,42 @@ Output: data/knowledge/style_profile.json
 """
 from __future__ import annotations
 
-import json
 import logging
+import re
+import sys
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import orjson
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger("aggregate_style")
 
+_PAREN_RE = re.compile(r"[（(].+?[）)]")
+
+
+def _load_style(path: str) -> dict | None:
+    """Return the style block of one analysis file, or None if unusable."""
+    with open(path, "rb") as f:
+        data = orjson.loads(f.read())
+    if data.get("skipped") or data.get("parse_error"):
+        return None
+    return data.get("style") or None
+
 
 def main() -> None:
     analysis_dir = Path("data/analysis")
     output_dir = Path("data/knowledge")
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    styles = []
-    for f in sorted(analysis_dir.glob("*.json")):
-        with open(f) as fh:
-            data = json.load(fh)
-        if data.get("skipped") or data.get("parse_error"):
-            continue
-        style = data.get("style", {})
-        if style:
-            styles.append(style)
+    from src.postprocess.manifest import json_files
+
+    with ProcessPoolExecutor() as ex:
+        loaded = ex.map(_load_style, json_files(analysis_dir), chunksize=8)
+        styles = [style for style in loaded if style]
 
     logger.info("Loaded style data from %d episodes", len(styles))
 
@@ -70,8 +83,7 @@ def main() -> None:
     for s in styles:
         for t in s.get("narrative_techniques", []):
             # Normalize: remove parenthetical examples
-            import re
-            base = re.sub(r"[（(].+?[）)]", "", t).strip()
+            base = _PAREN_RE.sub("", t).strip()
             techniques[base] += 1
 
     profile = {
@@ -103,8 +115,8 @@ def main() -> None:
     }
 
     out_path = output_dir / "style_profile.json"
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(profile, f, ensure_ascii=False, indent=2)
+    with open(out_path, "wb", buffering=1 << 20) as f:
+        f.write(orjson.dumps(profile, option=orjson.OPT_INDENT_2))
 
     logger.info("Style profile saved to %s", out_path)
     logger.info("Top 5 catchphrases: %s", [cp["phrase"] for cp in profile["catchphrases"][:5]])
@@ -7,10 +7,11 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import logging
+import os
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -19,41 +20,69 @@ logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(messag
 logger = logging.getLogger("analyze_batch")
 
 
-def process_one(transcript_path: Path, output_dir: Path, proofread_dir: Path) -> tuple[str, int | None, str | None]:
-    """Process a single episode. Returns (episode_id, entity_count, error)."""
-    from src.analyze import analyze_transcript
+async def run_batch(batch: list[Path], args: argparse.Namespace) -> tuple[int, int]:
+    """Analyze a batch concurrently. Returns (success, total_entities)."""
+    from src.analyze import analyze_transcripts_async
 
-    episode_id = transcript_path.stem
-    try:
-        result = analyze_transcript(
-            transcript_path,
-            output_dir=output_dir,
-            use_proofread=True,
-            proofread_dir=proofread_dir,
-        )
-        if result.get("skipped"):
-            return episode_id, None, "skipped"
-        return episode_id, len(result.get("entities", [])), None
-    except Exception as e:
-        logger.exception("Failed: %s", episode_id)
-        return episode_id, None, str(e)
+    success = 0
+    total_entities = 0
+
+    results = analyze_transcripts_async(
+        batch,
+        concurrency=args.workers,
+        output_dir=args.output_dir,
+        use_proofread=True,
+        proofread_dir=args.proofread_dir,
+        use_cache=not args.no_cache,
+        pretty_json=args.pretty_json,
+    )
+    i = 0
+    async for transcript_path, result in results:
+        i += 1
+        episode_id = transcript_path.stem
+        if isinstance(result, Exception):
+            logger.error(
+                "[%d/%d] %s: %s", i, len(batch), episode_id, result, exc_info=result
+            )
+        elif result.get("skipped"):
+            # Write marker so we don't retry forever
+            marker = args.output_dir / f"{episode_id}.json"
+            if not marker.exists():
+                with open(marker, "w") as f:
+                    json.dump(
+                        {"episode_id": episode_id, "skipped": True, "reason": "text too short"}, f
+                    )
+            success += 1
+            logger.warning("[%d/%d] %s: skipped (text too short)", i, len(batch), episode_id)
+        else:
+            entity_count = len(result.get("entities", []))
+            success += 1
+            total_entities += entity_count
+            logger.info("[%d/%d] %s: %d entities", i, len(batch), episode_id, entity_count)
+
+    return success, total_entities
 
 
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--batch-size", type=int, default=30)
-    parser.add_argument("--workers", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=10, help="Max concurrent LLM requests")
     parser.add_argument("--output-dir", type=Path, default=Path("data/analysis"))
     parser.add_argument("--transcript-dir", type=Path, default=Path("data/transcripts"))
     parser.add_argument("--proofread-dir", type=Path, default=Path("data/proofread"))
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached LLM replies")
+    parser.add_argument("--pretty-json", action="store_true", help="Indent the output JSON")
     args = parser.parse_args()
 
     args.output_dir.mkdir(parents=True, exist_ok=True)
 
     # Find episodes not yet analyzed
-    all_transcripts = sorted(args.transcript_dir.glob("*.json"))
-    done = {f.stem for f in args.output_dir.glob("*.json")}
-    pending = [f for f in all_transcripts if f.stem not in done]
+    all_ids = sorted(
+        e.name[:-5] for e in os.scandir(args.transcript_dir)
+        if e.name.endswith(".json") and e.is_file()
+    )
+    done = {e.name[:-5] for e in os.scandir(args.output_dir) if e.name.endswith(".json")}
+    pending = [args.transcript_dir / f"{ep_id}.json" for ep_id in all_ids if ep_id not in done]
 
     logger.info("Already analyzed: %d, pending: %d", len(done), len(pending))
 
@@ -64,30 +93,7 @@ def main() -> None:
     batch = pending[: args.batch_size]
     logger.info("Processing batch of %d episodes with %d workers...", len(batch), args.workers)
 
-    success = 0
-    total_entities = 0
-
-    with ThreadPoolExecutor(max_workers=args.workers) as pool:
-        futures = {
-            pool.submit(process_one, t, args.output_dir, args.proofread_dir): t
-            for t in batch
-        }
-        for i, future in enumerate(as_completed(futures), 1):
-            episode_id, entity_count, error = future.result()
-            if error == "skipped":
-                # Write marker so we don't retry forever
-                marker = args.output_dir / f"{episode_id}.json"
-                if not marker.exists():
-                    with open(marker, "w") as f:
-                        json.dump({"episode_id": episode_id, "skipped": True, "reason": "text too short"}, f)
-                success += 1
-                logger.warning("[%d/%d] %s: skipped (text too short)", i, len(batch), episode_id)
-            elif error:
-                logger.warning("[%d/%d] %s: %s", i, len(batch), episode_id, error)
-            else:
-                success += 1
-                total_entities += entity_count or 0
-                logger.info("[%d/%d] %s: %d entities", i, len(batch), episode_id, entity_count)
+    success, total_entities = asyncio.run(run_batch(batch, args))
 
     remaining = len(pending) - success
     logger.info(
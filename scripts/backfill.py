@@ -23,6 +23,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from src.ingest.filter import filter_episodes
 from src.ingest.rss import parse_feed
 from src.postprocess.formatter import save_transcript
+from src.postprocess.manifest import transcript_ids
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
 logger = logging.getLogger("backfill")
@@ -33,12 +34,7 @@ DEFAULT_FEED_URL = "https://feed.xyzfm.space/y9qnpfdrctnx"
 
 def existing_ids(output_dir: Path) -> set[str]:
     """Return episode IDs that already have transcripts."""
-    ids: set[str] = set()
-    if not output_dir.exists():
-        return ids
-    for f in output_dir.glob("*.json"):
-        ids.add(f.stem)
-    return ids
+    return transcript_ids(output_dir)
 
 
 def run(
@@ -88,8 +84,10 @@ def run(
 
     # 6. Transcribe (parallel via Modal) + save audio to HuggingFace
     try:
-        from src.transcribe.modal_whisper import app as modal_app, transcribe_episode
-        from src.transcribe.modal_audio import app as audio_app, download_and_upload_audio
+        from src.transcribe.modal_audio import app as audio_app
+        from src.transcribe.modal_audio import download_and_upload_audio
+        from src.transcribe.modal_whisper import Transcriber
+        from src.transcribe.modal_whisper import app as modal_app
     except ImportError:
         logger.error("Modal not available. Install with: pip install modal")
         return 1
@@ -113,26 +111,22 @@ def run(
     ]
 
     with modal_app.run():
-        # Launch transcriptions
-        for i, (result, ep) in enumerate(
-            zip(
-                transcribe_episode.starmap(transcribe_args),
-                batch,
-            )
-        ):
+        # Launch transcriptions; a failed episode comes back as an exception
+        results = Transcriber().transcribe.starmap(
+            transcribe_args, kwargs={"as_json_bytes": True}, return_exceptions=True,
+        )
+        for i, (ep, result) in enumerate(zip(batch, results), 1):
+            if isinstance(result, Exception):
+                logger.error(
+                    "[%d/%d] Failed to transcribe: %s (%s)", i, len(batch), ep.episode_id, result,
+                )
+                continue
             try:
                 save_transcript(result, output_dir=output_dir)
                 success += 1
-                logger.info(
-                    "[%d/%d] Done: %s — %s (%d words)",
-                    i + 1,
-                    len(batch),
-                    ep.episode_id,
-                    ep.title,
-                    result.get("word_count", 0),
-                )
+                logger.info("[%d/%d] Done: %s — %s", i, len(batch), ep.episode_id, ep.title)
             except Exception:
-                logger.exception("[%d/%d] Failed to save: %s", i + 1, len(batch), ep.episode_id)
+                logger.exception("[%d/%d] Failed to save: %s", i, len(batch), ep.episode_id)
 
     # Upload audio to HuggingFace (separate Modal app, CPU only)
     # Wrapped in try/except so audio failures don't block transcript saving
@@ -150,23 +144,22 @@ def run(
 
         try:
             with audio_app.run():
-                for i, (result, ep) in enumerate(
-                    zip(
-                        download_and_upload_audio.starmap(audio_args),
-                        batch,
-                    )
-                ):
-                    try:
-                        audio_success += 1
-                        logger.info(
-                            "[%d/%d] Audio uploaded: %s (%.1f MB)",
-                            i + 1,
-                            len(batch),
-                            result["filename"],
-                            result["size_mb"],
+                results = download_and_upload_audio.starmap(audio_args, return_exceptions=True)
+                for i, (ep, result) in enumerate(zip(batch, results), 1):
+                    if isinstance(result, Exception):
+                        logger.error(
+                            "[%d/%d] Audio upload failed: %s (%s)",
+                            i, len(batch), ep.episode_id, result,
                         )
-                    except Exception:
-                        logger.exception("[%d/%d] Audio upload failed: %s", i + 1, len(batch), ep.episode_id)
+                        continue
+                    audio_success += 1
+                    logger.info(
+                        "[%d/%d] Audio uploaded: %s (%.1f MB)",
+                        i,
+                        len(batch),
+                        result["filename"],
+                        result["size_mb"],
+                    )
         except Exception:
             logger.exception("Audio upload batch failed (transcripts are still saved)")
     else:
@@ -176,26 +169,26 @@ def run(
     if hf_token and success > 0:
         logger.info("Uploading %d transcripts to HuggingFace...", success)
         try:
-            from huggingface_hub import HfApi
+            from huggingface_hub import CommitOperationAdd, HfApi
 
             api = HfApi(token=hf_token)
             api.create_repo("Adam429/podcast-transcripts", repo_type="dataset", exist_ok=True)
 
-            transcript_uploaded = 0
-            for f in output_dir.iterdir():
-                if f.suffix in (".json", ".md"):
-                    ep_id = f.stem
-                    # Only upload files from this batch
-                    if any(ep.episode_id == ep_id for ep in batch):
-                        api.upload_file(
-                            path_or_fileobj=str(f),
-                            path_in_repo=f"transcripts/{f.name}",
-                            repo_id="Adam429/podcast-transcripts",
-                            repo_type="dataset",
-                            commit_message=f"Add transcript: {f.name}",
-                        )
-                        transcript_uploaded += 1
-            logger.info("Uploaded %d transcript files to HuggingFace", transcript_uploaded)
+            # Only upload files from this batch, all in a single commit
+            batch_ids = {ep.episode_id for ep in batch}
+            operations = [
+                CommitOperationAdd(path_in_repo=f"transcripts/{f.name}", path_or_fileobj=str(f))
+                for f in output_dir.iterdir()
+                if f.suffix in (".json", ".md") and f.stem in batch_ids
+            ]
+            if operations:
+                api.create_commit(
+                    repo_id="Adam429/podcast-transcripts",
+                    repo_type="dataset",
+                    operations=operations,
+                    commit_message=f"Add batch of {len(operations)} transcripts",
+                )
+            logger.info("Uploaded %d transcript files to HuggingFace", len(operations))
         except Exception:
             logger.exception("Transcript upload to HF failed (files are still in git)")
 
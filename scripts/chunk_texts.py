@@ -6,59 +6,82 @@ Output: data/knowledge/chunks.jsonl
 """
 from __future__ import annotations
 
-import json
 import logging
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import orjson
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger("chunk_texts")
 
 CHUNK_SIZE = 500  # target chars per chunk
 OVERLAP = 80      # overlap between chunks
 
+_SENTENCE_END_RE = re.compile(r"(?<=[。！？])")
+
 
 def split_into_chunks(text: str, episode_id: str, title: str) -> list[dict]:
     """Split text into overlapping chunks."""
     # Try to split on sentence boundaries (。！？)
-    sentences = re.split(r"(?<=[。！？])", text)
+    sentences = _SENTENCE_END_RE.split(text)
     sentences = [s.strip() for s in sentences if s.strip()]
 
     chunks = []
-    current = ""
+    # Accumulate sentences in a list and join only when a chunk is emitted
+    buf: list[str] = []
+    cur_len = 0
     chunk_idx = 0
 
     for sent in sentences:
-        if len(current) + len(sent) > CHUNK_SIZE and current:
+        if cur_len + len(sent) > CHUNK_SIZE and buf:
+            current = "".join(buf)
+            text = current.strip()
             chunks.append({
                 "chunk_id": f"{episode_id}_{chunk_idx:04d}",
                 "episode_id": episode_id,
                 "title": title,
-                "text": current.strip(),
+                "text": text,
                 "chunk_index": chunk_idx,
-                "char_count": len(current.strip()),
+                "char_count": len(text),
             })
             # Keep overlap
-            overlap_text = current[-OVERLAP:] if len(current) > OVERLAP else current
-            current = overlap_text + sent
+            overlap_text = current[-OVERLAP:]
+            buf = [overlap_text, sent]
+            cur_len = len(overlap_text) + len(sent)
             chunk_idx += 1
         else:
-            current += sent
+            buf.append(sent)
+            cur_len += len(sent)
 
     # Last chunk
-    if current.strip():
+    text = "".join(buf).strip()
+    if text:
         chunks.append({
             "chunk_id": f"{episode_id}_{chunk_idx:04d}",
             "episode_id": episode_id,
             "title": title,
-            "text": current.strip(),
+            "text": text,
             "chunk_index": chunk_idx,
-            "char_count": len(current.strip()),
+            "char_count": len(text),
         })
 
     return chunks
 
 
+def _load_and_chunk(path: str) -> list[dict] | None:
+    """Chunk one proofread episode; None if its text is too short."""
+    with open(path, "rb") as f:
+        data = orjson.loads(f.read())
+    text = data.get("transcription", "")
+    if len(text) < 100:
+        return None
+    episode_id = os.path.basename(path)[:-5]
+    return split_into_chunks(text, episode_id, data.get("title", ""))
+
+
 def main() -> None:
     proofread_dir = Path("data/proofread")
     paid_path = Path("data/paid_episodes.json")
@@ -68,35 +91,28 @@ def main() -> None:
     # Load paid episode list
     paid_ids = set()
     if paid_path.exists():
-        with open(paid_path) as f:
-            paid_ids = set(json.load(f))
+        paid_ids = set(orjson.loads(paid_path.read_bytes()))
 
     all_chunks = []
     episode_count = 0
 
-    for f in sorted(proofread_dir.glob("*.json")):
-        episode_id = f.stem
-        if episode_id in paid_ids:
-            continue
-
-        with open(f) as fh:
-            data = json.load(fh)
-
-        text = data.get("transcription", "")
-        title = data.get("title", "")
-
-        if len(text) < 100:
-            continue
-
-        chunks = split_into_chunks(text, episode_id, title)
-        all_chunks.extend(chunks)
-        episode_count += 1
+    # Skip paid episodes by name before touching their files
+    with os.scandir(proofread_dir) as it:
+        paths = sorted(
+            e.path for e in it if e.name.endswith(".json") and e.name[:-5] not in paid_ids
+        )
+    with ProcessPoolExecutor() as ex:
+        for chunks in ex.map(_load_and_chunk, paths, chunksize=32):
+            if chunks is None:
+                continue
+            all_chunks.extend(chunks)
+            episode_count += 1
 
     # Save as JSONL
     out_path = output_dir / "chunks.jsonl"
-    with open(out_path, "w", encoding="utf-8") as f:
-        for chunk in all_chunks:
-            f.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+    out_path.write_bytes(
+        b"".join([orjson.dumps(chunk, option=orjson.OPT_APPEND_NEWLINE) for chunk in all_chunks])
+    )
 
     logger.info(
         "Chunked %d episodes into %d chunks (avg %.0f chars/chunk)",
@@ -10,16 +10,19 @@ Output: data/knowledge/enriched/<entity_normalized>.json
 """
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
 import os
 import re
 import time
 import urllib.parse
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import httpx
+import lxml.html
+import orjson
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger("enrich_v2")
@@ -29,33 +32,107 @@ API_KEY = os.environ.get("API_KEY", "sk-luna-2026-openclaw")
 MODEL = os.environ.get("ENRICH_MODEL", "gemini-2.5-flash")
 WORKERS = int(os.environ.get("WORKERS", "20"))
 
+# WikiQuote is fetched politely: few concurrent requests; SEP tolerates more
+WIKIQUOTE_CONCURRENCY = 4
+SEP_CONCURRENCY = 16
+
+# On-disk cache of WikiQuote/SEP lookups, so reruns skip the network
+CACHE_DIR = Path(".cache/enrich")
+CACHE_TTL = 30 * 86400  # seconds
+
+BOT_HEADERS = {"User-Agent": "PodcastKnowledgeBot/1.0 (research project)"}
+
 TARGET_TYPES = {"person", "work", "event", "organization"}
 MIN_EPISODES = 3
 
+# Wikitext / HTML cleanup patterns
+_SECTION_RE = re.compile(r"^={2,3}(.+?)={2,3}$")
+# All wikitext markup in one alternation: [[link|label]], bold/italic quotes,
+# HTML tags, {{templates}}. Each alternative starts with a different
+# character, so one left-to-right pass replaces the former chain of subs.
+_WIKI_MARKUP_RE = re.compile(
+    r"\[\[(?:[^|\]]*\|)?([^\]]*)\]\]"
+    r"|'''?"
+    r"|<[^>]+>"
+    r"|\{\{[^}]*\}\}"
+)
+_WS_RE = re.compile(r"\s+")
+_CODE_BLOCK_RE = re.compile(r"```(?:json)?\s*\n?(.*?)```", re.DOTALL)
+
+
+# ── Fetch cache ─────────────────────────────────────────────────────
+
+def _cache_path(kind: str, name: str) -> Path:
+    digest = hashlib.sha1(name.encode("utf-8")).hexdigest()
+    return CACHE_DIR / kind / f"{digest}.json"
+
+
+def _cache_get(kind: str, name: str):
+    """Return the cached value, or None if missing or older than CACHE_TTL."""
+    path = _cache_path(kind, name)
+    try:
+        if time.time() - path.stat().st_mtime > CACHE_TTL:
+            return None
+        return orjson.loads(path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+
+def _cache_put(kind: str, name: str, value) -> None:
+    """Store value atomically (tmp + rename), so an interrupted run leaves no partial entry."""
+    path = _cache_path(kind, name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_bytes(orjson.dumps(value))
+    os.replace(tmp, path)
+
 
 # ── Layer 1: WikiQuote ──────────────────────────────────────────────
 
-def fetch_wikiquote(name: str) -> list[dict]:
+async def fetch_wikiquote_async(client: httpx.AsyncClient, name: str) -> list[dict]:
     """Fetch quotes from Chinese WikiQuote."""
-    encoded = urllib.parse.quote(name)
-    url = f"https://zh.wikiquote.org/w/api.php?action=parse&page={encoded}&prop=wikitext&format=json&redirects=1"
+    cached = _cache_get("wikiquote", name)
+    if cached is not None:
+        return cached
     try:
-        resp = httpx.get(
-            url, timeout=15, follow_redirects=True,
-            headers={"User-Agent": "PodcastKnowledgeBot/1.0 (research project)"},
+        resp = await client.get(
+            _wikiquote_url(name), timeout=15, follow_redirects=True, headers=BOT_HEADERS,
         )
-        if resp.status_code != 200:
-            return []
-        data = resp.json()
-        wikitext = data.get("parse", {}).get("wikitext", {}).get("*", "")
-        if not wikitext or "missingtitle" in str(data.get("error", "")):
-            return []
-        return _parse_wikiquote(wikitext)
+        quotes = _quotes_from_response(resp)
+        if resp.status_code == 200:
+            _cache_put("wikiquote", name, quotes)
+        return quotes
     except Exception as e:
         logger.debug("WikiQuote error for %s: %s", name, e)
         return []
 
 
+def _wikiquote_url(name: str) -> str:
+    encoded = urllib.parse.quote(name)
+    return f"https://zh.wikiquote.org/w/api.php?action=parse&page={encoded}&prop=wikitext&format=json&redirects=1"
+
+
+def _quotes_from_response(resp: httpx.Response) -> list[dict]:
+    if resp.status_code != 200:
+        return []
+    data = resp.json()
+    wikitext = data.get("parse", {}).get("wikitext", {}).get("*", "")
+    if not wikitext or "missingtitle" in str(data.get("error", "")):
+        return []
+    return _parse_wikiquote(wikitext)
+
+
+def _strip_wiki_markup(text: str) -> str:
+    """Remove wiki markup, keeping link labels."""
+    return _WIKI_MARKUP_RE.sub(_wiki_markup_repl, text)
+
+
+def _wiki_markup_repl(m: re.Match) -> str:
+    # Link labels can themselves carry markup; everything else is dropped
+    label = m.group(1)
+    return _strip_wiki_markup(label) if label else ""
+
+
 def _parse_wikiquote(wikitext: str) -> list[dict]:
     """Parse WikiQuote wikitext into structured quotes."""
     quotes = []
@@ -63,7 +140,7 @@ def _parse_wikiquote(wikitext: str) -> list[dict]:
     for line in wikitext.split("\n"):
         line = line.strip()
         # Section headers
-        m = re.match(r"^={2,3}(.+?)={2,3}$", line)
+        m = _SECTION_RE.match(line)
         if m:
             current_section = m.group(1).strip()
             continue
@@ -71,12 +148,7 @@ def _parse_wikiquote(wikitext: str) -> list[dict]:
         if line.startswith("*") and not line.startswith("**"):
             text = line.lstrip("*").strip()
             # Remove wiki markup
-            text = re.sub(r"\[\[(?:[^|\]]*\|)?([^\]]*)\]\]", r"\1", text)
-            text = re.sub(r"'''?", "", text)
-            text = re.sub(r"<[^>]+>", "", text)
-            text = re.sub(r"\{\{[^}]*\}\}", "", text)
-            text = re.sub(r"<ref[^>]*>.*?</ref>", "", text)
-            text = text.strip()
+            text = _strip_wiki_markup(text).strip()
             if len(text) > 10 and len(text) < 500:
                 # Extract source (often after ——)
                 source = ""
@@ -142,35 +214,53 @@ SEP_SLUGS = {
 }
 
 
-def fetch_sep(name: str) -> str:
+async def fetch_sep_async(client: httpx.AsyncClient, name: str) -> str:
     """Fetch SEP article summary (first ~2000 chars)."""
     slug = SEP_SLUGS.get(name)
     if not slug:
         return ""
-    url = f"https://plato.stanford.edu/entries/{slug}/"
+    cached = _cache_get("sep", slug)
+    if cached is not None:
+        return cached
     try:
-        resp = httpx.get(
-            url, timeout=15, follow_redirects=True,
-            headers={"User-Agent": "PodcastKnowledgeBot/1.0 (research project)"},
+        resp = await client.get(
+            _sep_url(slug), timeout=15, follow_redirects=True, headers=BOT_HEADERS,
         )
-        if resp.status_code != 200:
-            return ""
-        # Extract text content (rough)
-        html = resp.text
-        # Get preamble (before first <h2>)
-        m = re.search(r'<div id="preamble">(.*?)</div>', html, re.DOTALL)
-        if not m:
-            m = re.search(r'<div id="aueditable">(.*?)<h2', html, re.DOTALL)
-        if m:
-            text = re.sub(r"<[^>]+>", "", m.group(1))
-            text = re.sub(r"\s+", " ", text).strip()
-            return text[:3000]
-        return ""
+        text = _sep_text_from_response(resp)
+        if resp.status_code == 200:
+            _cache_put("sep", slug, text)
+        return text
     except Exception as e:
         logger.debug("SEP error for %s: %s", name, e)
         return ""
 
 
+def _sep_url(slug: str) -> str:
+    return f"https://plato.stanford.edu/entries/{slug}/"
+
+
+def _sep_text_from_response(resp: httpx.Response) -> str:
+    if resp.status_code != 200 or not resp.content:
+        return ""
+    tree = lxml.html.fromstring(resp.content)
+    # Prefer the preamble; otherwise the article body up to its first <h2>
+    preamble = tree.xpath('//div[@id="preamble"]')
+    if preamble:
+        text = preamble[0].text_content()
+    else:
+        body = tree.xpath('//div[@id="aueditable"]')
+        if not body:
+            return ""
+        parts = [body[0].text or ""]
+        for child in body[0]:
+            if child.tag == "h2":
+                break
+            parts.append(child.text_content())
+            parts.append(child.tail or "")
+        text = "".join(parts)
+    return _WS_RE.sub(" ", text).strip()[:3000]
+
+
 # ── Layer 3: LLM Synthesis ──────────────────────────────────────────
 
 SYNTHESIS_PROMPT = """你是一个人文知识库助手。请根据以下收集到的真实资料，为这个实体生成结构化的知识卡片。
@@ -205,48 +295,14 @@ SYNTHESIS_PROMPT = """你是一个人文知识库助手。请根据以下收集
 4. 保持学术准确性"""
 
 
-def synthesize(entity: dict, quotes: list[dict], sep_text: str) -> dict | None:
+async def synthesize_async(client: httpx.AsyncClient, entity: dict, prompt: str) -> dict | None:
     """Use LLM to synthesize collected knowledge into structured card."""
-    # Build prompt sections
-    wikiquote_section = ""
-    if quotes:
-        lines = [f"- 「{q['text']}」" + (f" ——{q['source']}" if q['source'] else "") for q in quotes[:20]]
-        wikiquote_section = "【WikiQuote 名言】\n" + "\n".join(lines)
-    else:
-        wikiquote_section = "【WikiQuote 名言】无数据"
-
-    sep_section = ""
-    if sep_text:
-        sep_section = f"【Stanford Encyclopedia of Philosophy】\n{sep_text[:2000]}"
-    else:
-        sep_section = "【SEP】无数据"
-
-    contexts = []
-    for ep in entity.get("episodes", [])[:3]:
-        ctx = ep.get("context", "")
-        if ctx:
-            contexts.append(f"[{ep.get('title', '')}] {ctx}")
-    context_section = "【播客上下文】\n" + "\n".join(contexts) if contexts else "【播客上下文】无"
-
-    prompt = SYNTHESIS_PROMPT.format(
-        name=entity["name"],
-        type=entity["type"],
-        episode_count=entity["episode_count"],
-        wikiquote_section=wikiquote_section,
-        sep_section=sep_section,
-        context_section=context_section,
-    )
-
+    payload = _synthesis_payload(prompt)
     try:
-        resp = httpx.post(
+        resp = await client.post(
             f"{API_BASE}/chat/completions",
             headers={"Authorization": f"Bearer {API_KEY}"},
-            json={
-                "model": MODEL,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.3,
-                "max_tokens": 4096,
-            },
+            json=payload,
             timeout=120,
         )
         resp.raise_for_status()
@@ -257,14 +313,65 @@ def synthesize(entity: dict, quotes: list[dict], sep_text: str) -> dict | None:
         return None
 
 
+def _synthesis_payload(prompt: str) -> dict:
+    return {
+        "model": MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.3,
+        "max_tokens": 4096,
+    }
+
+
+def _wikiquote_section(quotes: list[dict]) -> str:
+    if not quotes:
+        return "【WikiQuote 名言】无数据"
+    lines = [
+        f"- 「{q['text']}」" + (f" ——{q['source']}" if q['source'] else "") for q in quotes[:20]
+    ]
+    return "【WikiQuote 名言】\n" + "\n".join(lines)
+
+
+def _sep_section(sep_text: str) -> str:
+    if not sep_text:
+        return "【SEP】无数据"
+    return f"【Stanford Encyclopedia of Philosophy】\n{sep_text[:2000]}"
+
+
+def _render_prompt(entity: dict, wikiquote_section: str, sep_section: str) -> str:
+    """Fill SYNTHESIS_PROMPT; the source sections are rendered ahead of time."""
+    contexts = []
+    for ep in entity.get("episodes", [])[:3]:
+        ctx = ep.get("context", "")
+        if ctx:
+            contexts.append(f"[{ep.get('title', '')}] {ctx}")
+    context_section = "【播客上下文】\n" + "\n".join(contexts) if contexts else "【播客上下文】无"
+
+    return SYNTHESIS_PROMPT.format_map({
+        "name": entity["name"],
+        "type": entity["type"],
+        "episode_count": entity["episode_count"],
+        "wikiquote_section": wikiquote_section,
+        "sep_section": sep_section,
+        "context_section": context_section,
+    })
+
+
 def _parse_json(text: str) -> dict | None:
     """Extract JSON from LLM response."""
+    # Happy path: the whole reply is JSON, optionally inside one ``` fence
+    content = text.strip()
+    if content.startswith("```"):
+        content = content[3:].removeprefix("json").removesuffix("```")
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        pass
     # Try code block
-    m = re.search(r"```(?:json)?\s*\n?(.*?)```", text, re.DOTALL)
+    m = _CODE_BLOCK_RE.search(text)
     if m:
         try:
-            return json.loads(m.group(1))
-        except json.JSONDecodeError:
+            return orjson.loads(m.group(1))
+        except orjson.JSONDecodeError:
             pass
     # Brace matching
     start = text.find("{")
@@ -277,43 +384,106 @@ def _parse_json(text: str) -> dict | None:
                 depth -= 1
                 if depth == 0:
                     try:
-                        return json.loads(text[start : i + 1])
-                    except json.JSONDecodeError:
+                        return orjson.loads(text[start : i + 1])
+                    except orjson.JSONDecodeError:
                         break
     return None
 
 
 # ── Main Pipeline ───────────────────────────────────────────────────
 
-def enrich_one(entity: dict, output_dir: Path) -> dict | None:
-    """Full enrichment pipeline for one entity."""
-    normalized = entity["normalized"]
-    out_path = output_dir / f"{normalized}.json"
-    if out_path.exists():
-        return None
-
-    name = entity["name"]
-
-    # Layer 1: WikiQuote
-    quotes = fetch_wikiquote(name)
+def _save_card(
+    result: dict, entity: dict, quotes: list[dict], sep_text: str, out_path: Path
+) -> None:
+    """Attach source metadata to a synthesized card and write it."""
+    result["_sources"] = {
+        "wikiquote_count": len(quotes),
+        "sep_available": bool(sep_text),
+    }
+    result["entity_normalized"] = entity["normalized"]
+    result["episode_count"] = entity["episode_count"]
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+async def prefetch_all(entities: list[dict]) -> dict[str, dict]:
+    """Fetch WikiQuote quotes and SEP text for all entities concurrently.
+
+    Returns {normalized: {"quotes": [...], "sep": str, "prompt": str}}, with
+    the synthesis prompt rendered here so Phase 2 only sends it.
+    """
+    wq_sem = asyncio.Semaphore(WIKIQUOTE_CONCURRENCY)
+    sep_sem = asyncio.Semaphore(SEP_CONCURRENCY)
+    prefetched: dict[str, dict] = {}
+
+    async with httpx.AsyncClient(http2=True, timeout=30) as client:
+
+        async def wikiquote(name: str) -> list[dict]:
+            async with wq_sem:
+                return await fetch_wikiquote_async(client, name)
+
+        async def sep(name: str) -> str:
+            async with sep_sem:
+                return await fetch_sep_async(client, name)
+
+        async def prefetch_one(entity: dict) -> tuple[str, dict]:
+            quotes, sep_text = await asyncio.gather(
+                wikiquote(entity["name"]), sep(entity["name"])
+            )
+            prompt = _render_prompt(entity, _wikiquote_section(quotes), _sep_section(sep_text))
+            return entity["normalized"], {"quotes": quotes, "sep": sep_text, "prompt": prompt}
+
+        tasks = [prefetch_one(e) for e in entities]
+        for i, next_done in enumerate(asyncio.as_completed(tasks), 1):
+            normalized, data = await next_done
+            prefetched[normalized] = data
+            if i % 50 == 0:
+                wq = sum(1 for v in prefetched.values() if v["quotes"])
+                sp = sum(1 for v in prefetched.values() if v["sep"])
+                logger.info("  Fetched %d/%d (WikiQuote: %d, SEP: %d)", i, len(entities), wq, sp)
+
+    return prefetched
+
+
+async def synthesize_all(
+    entities: list[dict], prefetched: dict[str, dict], output_dir: Path, workers: int
+) -> tuple[int, int]:
+    """Synthesize cards for all entities concurrently. Returns (done, failed)."""
+    sem = asyncio.Semaphore(workers)
+    done = 0
+    failed = 0
 
-    # Layer 2: SEP
-    sep_text = fetch_sep(name)
+    async with httpx.AsyncClient(
+        http2=True, limits=httpx.Limits(max_connections=workers), timeout=120
+    ) as client:
+
+        async def synth_one(entity: dict) -> dict | None:
+            out_path = output_dir / f"{entity['normalized']}.json"
+            if out_path.exists():
+                return None
+            data = prefetched[entity["normalized"]]
+            async with sem:
+                result = await synthesize_async(client, entity, data["prompt"])
+            if result:
+                _save_card(result, entity, data["quotes"], data["sep"], out_path)
+            return result
 
-    # Layer 3: LLM synthesis
-    result = synthesize(entity, quotes, sep_text)
+        async def guarded(entity: dict) -> dict | None:
+            try:
+                return await synth_one(entity)
+            except Exception as e:
+                logger.error("Exception for %s: %s", entity["name"], e)
+                return None
+
+        for next_done in asyncio.as_completed([guarded(e) for e in entities]):
+            if await next_done:
+                done += 1
+                if done % 50 == 0:
+                    logger.info("  Synthesized: %d/%d", done, len(entities))
+            else:
+                failed += 1
 
-    if result:
-        result["_sources"] = {
-            "wikiquote_count": len(quotes),
-            "sep_available": bool(sep_text),
-        }
-        result["entity_normalized"] = normalized
-        result["episode_count"] = entity["episode_count"]
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
-        return result
-    return None
+    return done, failed
 
 
 def main() -> None:
@@ -352,19 +522,9 @@ def main() -> None:
         logger.info("Nothing to do!")
         return
 
-    # Phase 1: Fetch external data sequentially (WikiQuote rate-limited)
+    # Phase 1: Fetch external data concurrently (WikiQuote concurrency-limited)
     logger.info("Phase 1: Fetching external data (WikiQuote + SEP)...")
-    prefetched = {}
-    for i, entity in enumerate(pending):
-        name = entity["name"]
-        quotes = fetch_wikiquote(name)
-        time.sleep(0.5)  # Rate limit WikiQuote
-        sep_text = fetch_sep(name)
-        prefetched[entity["normalized"]] = {"quotes": quotes, "sep": sep_text}
-        if (i + 1) % 50 == 0:
-            wq = sum(1 for v in prefetched.values() if v["quotes"])
-            sp = sum(1 for v in prefetched.values() if v["sep"])
-            logger.info("  Fetched %d/%d (WikiQuote: %d, SEP: %d)", i + 1, len(pending), wq, sp)
+    prefetched = asyncio.run(prefetch_all(pending))
 
     wq_total = sum(1 for v in prefetched.values() if v["quotes"])
     sep_total = sum(1 for v in prefetched.values() if v["sep"])
@@ -375,43 +535,7 @@ def main() -> None:
 
     # Phase 2: LLM synthesis in parallel
     logger.info("Phase 2: LLM synthesis (%d workers)...", args.workers)
-    done = 0
-    failed = 0
-
-    def synth_one(entity: dict) -> dict | None:
-        normalized = entity["normalized"]
-        out_path = output_dir / f"{normalized}.json"
-        if out_path.exists():
-            return None
-        data = prefetched[normalized]
-        result = synthesize(entity, data["quotes"], data["sep"])
-        if result:
-            result["_sources"] = {
-                "wikiquote_count": len(data["quotes"]),
-                "sep_available": bool(data["sep"]),
-            }
-            result["entity_normalized"] = normalized
-            result["episode_count"] = entity["episode_count"]
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
-            return result
-        return None
-
-    with ThreadPoolExecutor(max_workers=args.workers) as pool:
-        futures = {pool.submit(synth_one, e): e for e in pending}
-        for future in as_completed(futures):
-            entity = futures[future]
-            try:
-                result = future.result()
-                if result:
-                    done += 1
-                    if done % 50 == 0:
-                        logger.info("  Synthesized: %d/%d", done, len(pending))
-                else:
-                    failed += 1
-            except Exception as e:
-                failed += 1
-                logger.error("Exception for %s: %s", entity["name"], e)
+    done, failed = asyncio.run(synthesize_all(pending, prefetched, output_dir, args.workers))
 
     logger.info(
         "Complete: %d enriched, %d failed. Sources: WikiQuote=%d, SEP=%d",
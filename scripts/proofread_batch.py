@@ -8,6 +8,7 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
 import os
 import sys
@@ -19,6 +20,14 @@ logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(messag
 logger = logging.getLogger("proofread_batch")
 
 
+def _set_output(name: str, value) -> None:
+    """Publish a step output to GitHub Actions (no-op outside a runner)."""
+    out = os.environ.get("GITHUB_OUTPUT")
+    if out:
+        with open(out, "a") as f:
+            f.write(f"{name}={value}\n")
+
+
 def existing_ids(output_dir: Path) -> set[str]:
     """Return episode IDs already proofread."""
     ids: set[str] = set()
@@ -37,6 +46,9 @@ def run(
     api_base: str = "",
     api_key: str = "",
     model: str = "",
+    concurrency: int = 10,
+    use_cache: bool = True,
+    pretty_json: bool = False,
 ) -> int:
     # 1. Find all transcripts
     all_transcripts = sorted(transcript_dir.glob("*.json"))
@@ -49,6 +61,7 @@ def run(
 
     if not pending:
         logger.info("All transcripts already proofread. Nothing to do.")
+        _set_output("remaining", 0)
         return 0
 
     # 3. Batch
@@ -62,11 +75,11 @@ def run(
         logger.info("Remaining: %d", len(pending) - len(batch))
         return 0
 
-    # 4. Proofread
-    from src.proofread import proofread_transcript
+    # 4. Proofread (concurrently; each episode writes its own files)
+    from src.proofread import proofread_transcripts_async
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    kwargs = {}
+    kwargs = {"use_cache": use_cache, "pretty_json": pretty_json}
     if api_base:
         kwargs["api_base"] = api_base
     if api_key:
@@ -76,17 +89,28 @@ def run(
 
     success = 0
     total_changes = 0
-    for i, t in enumerate(batch):
-        try:
-            result = proofread_transcript(t, output_dir=output_dir, **kwargs)
+
+    async def proofread_all() -> None:
+        nonlocal success, total_changes
+        results = proofread_transcripts_async(
+            batch, concurrency=concurrency, output_dir=output_dir, **kwargs
+        )
+        i = 0
+        async for t, result in results:
+            i += 1
+            if isinstance(result, Exception):
+                logger.error(
+                    "[%d/%d] Failed: %s (%s)", i, len(batch), t.stem, result, exc_info=result
+                )
+                continue
             success += 1
             total_changes += len(result.get("changes", []))
             logger.info(
                 "[%d/%d] %s: %d changes",
-                i + 1, len(batch), t.stem, len(result.get("changes", [])),
+                i, len(batch), t.stem, len(result.get("changes", [])),
             )
-        except Exception:
-            logger.exception("[%d/%d] Failed: %s", i + 1, len(batch), t.stem)
+
+    asyncio.run(proofread_all())
 
     remaining = len(pending) - len(batch)
     logger.info(
@@ -94,7 +118,7 @@ def run(
         success, len(batch), total_changes, remaining,
     )
     # Output remaining for chain trigger
-    print(f"::set-output name=remaining::{remaining}")
+    _set_output("remaining", remaining)
     return 0
 
 
@@ -104,9 +128,12 @@ def main() -> None:
     parser.add_argument("--output-dir", type=Path, default=Path("data/proofread"))
     parser.add_argument("--batch-size", type=int, default=10)
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=10, help="Max concurrent LLM requests")
     parser.add_argument("--api-base", default=os.environ.get("API_BASE", ""))
     parser.add_argument("--api-key", default=os.environ.get("API_KEY", ""))
     parser.add_argument("--model", default=os.environ.get("PROOFREAD_MODEL", ""))
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached LLM replies")
+    parser.add_argument("--pretty-json", action="store_true", help="Indent the output JSON")
     args = parser.parse_args()
 
     sys.exit(run(
@@ -117,6 +144,9 @@ def main() -> None:
         api_base=args.api_base,
         api_key=args.api_key,
         model=args.model,
+        concurrency=args.concurrency,
+        use_cache=not args.no_cache,
+        pretty_json=args.pretty_json,
     ))
 
 
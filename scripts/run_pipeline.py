@@ -3,11 +3,16 @@
 
 Called by the check-new-episodes GitHub Action.
 Skips episodes that already have transcripts in the output directory.
+
+With --force-ids, skips RSS/filter/dedup and re-transcribes the listed
+episodes from their audio on HF (used by the retranscribe workflow).
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import json
 import logging
 import os
 import sys
@@ -17,37 +22,115 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from src.ingest.filter import filter_episodes
-from src.ingest.rss import parse_feed
+from src.ingest.rss import parse_feeds
+from src.models import Episode
 from src.postprocess.formatter import save_transcript
+from src.postprocess.manifest import transcript_ids
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
 logger = logging.getLogger("run_pipeline")
 
 DEFAULT_PODCAST_ID = os.environ.get("PODCAST_ID", "")
+HF_AUDIO_URL = "https://huggingface.co/datasets/Adam429/podcast-audio/resolve/main/audio/{name}"
 
 
 def existing_ids(output_dir: Path) -> set[str]:
     """Return episode IDs that already have transcripts."""
-    ids: set[str] = set()
-    if not output_dir.exists():
-        return ids
-    for f in output_dir.glob("*.json"):
-        ids.add(f.stem)
-    return ids
+    return transcript_ids(output_dir)
+
+
+def hf_audio_files() -> set[str]:
+    """Return audio filenames on HF (e.g. "<id>.m4a") from the cached repo listing."""
+    from huggingface_hub import HfApi
+
+    from src.publish.hub import cached_repo_files
+
+    api = HfApi(token=os.environ.get("HF_TOKEN") or None)
+    return {
+        f.rsplit("/", 1)[-1] for f in cached_repo_files(api, "Adam429/podcast-audio")
+        if f.startswith("audio/")
+    }
+
+
+async def probe_hf_audio(episode_ids: list[str]) -> set[str]:
+    """HEAD-probe HF for each episode's audio, all over one pooled HTTP/2 client."""
+    import httpx
+
+    token = os.environ.get("HF_TOKEN", "")
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    async def probe(client: httpx.AsyncClient, eid: str) -> str | None:
+        for ext in ("m4a", "mp3"):
+            name = f"{eid}.{ext}"
+            try:
+                resp = await client.head(HF_AUDIO_URL.format(name=name), follow_redirects=True)
+            except httpx.HTTPError as e:
+                # A failed probe counts as "not present" rather than aborting the run
+                logger.warning("HF probe failed for %s: %s", name, e)
+                continue
+            if resp.status_code == 200:
+                return name
+        return None
+
+    async with httpx.AsyncClient(
+        http2=True, headers=headers, timeout=30.0, limits=httpx.Limits(max_connections=16),
+    ) as client:
+        found = await asyncio.gather(*(probe(client, eid) for eid in episode_ids))
+    return {name for name in found if name}
+
+
+def forced_episodes(episode_ids: list[str], output_dir: Path) -> list[Episode]:
+    """Build episodes to re-transcribe from their existing transcript metadata.
+
+    Episodes without audio on HF are skipped rather than dispatched to Modal.
+    """
+    try:
+        audio_files = hf_audio_files()
+    except Exception as e:
+        logger.warning("HF audio listing failed (%s), probing files directly", e)
+        audio_files = asyncio.run(probe_hf_audio(episode_ids))
+    episodes = []
+    for eid in episode_ids:
+        names = [f"{eid}.{ext}" for ext in ("m4a", "mp3")]
+        name = next((n for n in names if n in audio_files), None)
+        if name is None:
+            logger.warning("No audio on HF for %s, skipping", eid)
+            continue
+        try:
+            with open(output_dir / f"{eid}.json", encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            logger.warning("No existing transcript for %s, skipping", eid)
+            continue
+        episodes.append(Episode(
+            episode_id=eid,
+            title=meta.get("title", ""),
+            date=meta.get("date", ""),
+            duration=meta.get("duration", 0),
+            audio_url=HF_AUDIO_URL.format(name=name),
+        ))
+    return episodes
 
 
 def run(
     podcast_id: str,
     max_episodes: int,
     output_dir: Path,
+    force_ids: list[str] | None = None,
 ) -> int:
+    if force_ids:
+        episodes = forced_episodes(force_ids, output_dir)
+        logger.info("Re-transcribing %d/%d forced episodes", len(episodes), len(force_ids))
+        return transcribe(episodes, output_dir)
+
     if not podcast_id:
         logger.error("No podcast ID provided. Set PODCAST_ID env var or pass --podcast-id.")
         return 1
 
-    # 1. Fetch RSS
+    # 1. Fetch RSS (comma-separated IDs are fetched concurrently)
     logger.info("Fetching RSS for: %s", podcast_id)
-    episodes = parse_feed(podcast_id, max_episodes=0)
+    feeds = parse_feeds([pid.strip() for pid in podcast_id.split(",") if pid.strip()])
+    episodes = [ep for eps in feeds.values() for ep in eps]
     logger.info("Found %d episodes in feed", len(episodes))
 
     # 2. Filter
@@ -69,29 +152,40 @@ def run(
         logger.info("Processing %d episodes (max_episodes=%d)", len(episodes), max_episodes)
 
     # 5. Transcribe via Modal
+    return transcribe(episodes, output_dir)
+
+
+def transcribe(episodes: list[Episode], output_dir: Path) -> int:
+    """Transcribe episodes in one Modal app run and save the results."""
+    if not episodes:
+        return 0
+
     try:
-        from src.transcribe.modal_whisper import app as modal_app, transcribe_episode
+        from src.transcribe.modal_whisper import Transcriber
+        from src.transcribe.modal_whisper import app as modal_app
     except ImportError:
         logger.error("Modal not available. Install with: pip install modal")
         return 1
 
+    # All episodes run concurrently on Modal; results come back in input order
+    args = [(ep.audio_url, ep.episode_id, ep.title, ep.date, ep.duration) for ep in episodes]
+    logger.info("Transcribing %d episodes on Modal...", len(episodes))
+
     success = 0
     with modal_app.run():
-        for ep in episodes:
-            logger.info("Transcribing: %s — %s", ep.episode_id, ep.title)
+        results = Transcriber().transcribe.starmap(
+            args, kwargs={"as_json_bytes": True}, return_exceptions=True,
+        )
+        for ep, result in zip(episodes, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to transcribe: %s (%s)", ep.episode_id, result)
+                continue
             try:
-                result = transcribe_episode.remote(
-                    audio_url=ep.audio_url,
-                    episode_id=ep.episode_id,
-                    title=ep.title,
-                    date=ep.date,
-                    duration=ep.duration,
-                )
                 save_transcript(result, output_dir=output_dir)
                 success += 1
-                logger.info("Done: %s (%d words)", ep.episode_id, result.get("word_count", 0))
+                logger.info("Done: %s", ep.episode_id)
             except Exception:
-                logger.exception("Failed to transcribe: %s", ep.episode_id)
+                logger.exception("Failed to save: %s", ep.episode_id)
 
     logger.info("Pipeline complete: %d/%d transcribed", success, len(episodes))
     return 0
@@ -99,12 +193,18 @@ def run(
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Podcast transcription pipeline")
-    parser.add_argument("--podcast-id", default=DEFAULT_PODCAST_ID)
+    parser.add_argument(
+        "--podcast-id", default=DEFAULT_PODCAST_ID, help="Podcast ID, or several comma-separated"
+    )
     parser.add_argument("--max-episodes", type=int, default=5)
     parser.add_argument("--output-dir", type=Path, default=Path("data/transcripts"))
+    parser.add_argument(
+        "--force-ids", nargs="+", metavar="EPISODE_ID",
+        help="Re-transcribe these episodes from HF audio, bypassing RSS and dedup",
+    )
     args = parser.parse_args()
 
-    sys.exit(run(args.podcast_id, args.max_episodes, args.output_dir))
+    sys.exit(run(args.podcast_id, args.max_episodes, args.output_dir, force_ids=args.force_ids))
 
 
 if __name__ == "__main__":
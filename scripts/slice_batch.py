@@ -14,6 +14,8 @@ import os
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
 logger = logging.getLogger("slice_batch")
 
@@ -26,9 +28,12 @@ def get_done_episodes() -> set[str]:
     """Check HF for already-sliced episodes."""
     try:
         from huggingface_hub import HfApi
+
+        from src.publish.hub import cached_repo_files
+
         api = HfApi(token=HF_TOKEN)
-        # Use list_repo_files (flat string list) — more reliable than list_repo_tree
-        files = api.list_repo_files(OUTPUT_REPO, repo_type="dataset")
+        # Flat file list, re-fetched only when the repo has new commits
+        files = cached_repo_files(api, OUTPUT_REPO)
         done = set()
         for f in files:
             # Each sliced episode has slices/<episode_id>/analysis.json
@@ -43,18 +48,20 @@ def get_done_episodes() -> set[str]:
         return set()
 
 
-def get_all_episodes() -> list[str]:
+def get_all_episodes() -> set[str]:
     """Get all episode IDs from local transcripts."""
-    transcript_dir = Path("data/transcripts")
-    return sorted(f.stem for f in transcript_dir.glob("*.json"))
+    from src.postprocess.manifest import transcript_ids
 
+    return transcript_ids(Path("data/transcripts"))
 
-def run(batch_size: int = 10, dry_run: bool = False) -> int:
+
+def run(batch_size: int = 10, dry_run: bool = False, vad: str = "webrtc") -> int:
     all_eps = get_all_episodes()
     logger.info("Total episodes: %d", len(all_eps))
 
     done = get_done_episodes()
-    pending = [ep for ep in all_eps if ep not in done]
+    # Only the pending set needs a stable order for batch selection
+    pending = sorted(all_eps - done)
     logger.info("Already sliced: %d, pending: %d", len(done), len(pending))
 
     if not pending:
@@ -71,7 +78,6 @@ def run(batch_size: int = 10, dry_run: bool = False) -> int:
         logger.info("Remaining: %d episodes", remaining)
         return 0
 
-    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
     from src.slice.modal_slice import app, slice_episode
 
     args = [(ep, AUDIO_REPO, OUTPUT_REPO, HF_TOKEN) for ep in batch]
@@ -79,9 +85,13 @@ def run(batch_size: int = 10, dry_run: bool = False) -> int:
     success = 0
     total_segments = 0
     with app.run():
-        for i, result in enumerate(slice_episode.starmap(args)):
+        # Fans out across containers; a crashed episode comes back as its exception
+        results = slice_episode.starmap(args, kwargs={"vad": vad}, return_exceptions=True)
+        for i, result in enumerate(results):
             ep = batch[i]
-            if "error" in result:
+            if isinstance(result, Exception):
+                logger.error("[%d/%d] %s: %s", i + 1, len(batch), ep, result)
+            elif "error" in result:
                 logger.error("[%d/%d] %s: %s", i + 1, len(batch), ep, result["error"])
             else:
                 success += 1
@@ -104,8 +114,11 @@ def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--batch-size", type=int, default=10)
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument(
+        "--vad", choices=("webrtc", "energy"), default="webrtc", help="Speech detector"
+    )
     args = parser.parse_args()
-    sys.exit(run(batch_size=args.batch_size, dry_run=args.dry_run))
+    sys.exit(run(batch_size=args.batch_size, dry_run=args.dry_run, vad=args.vad))
 
 
 if __name__ == "__main__":
@@ -9,6 +9,7 @@ from __future__ import annotations
 import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -25,47 +26,47 @@ def main() -> None:
 
     from huggingface_hub import HfApi
 
+    from src.postprocess.manifest import transcript_ids
+    from src.publish.hub import configure_hf_session
+
+    configure_hf_session()
     api = HfApi(token=hf_token)
 
     # --- Sync proofread ---
     sync_proofread(api, hf_token)
 
+    # Both listings are independent network round-trips, so overlap them
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        tr_future = ex.submit(_hf_files, api, "Adam429/podcast-transcripts", "transcripts/")
+        audio_future = ex.submit(_hf_files, api, "Adam429/podcast-audio", "audio/")
+    hf_tr = tr_future.result()
+    hf_audio = {f.split("/")[-1].split(".")[0] for f in audio_future.result()}
+
     # --- Sync transcripts ---
     transcript_dir = Path("data/transcripts")
     local_files = sorted(transcript_dir.glob("*.*")) if transcript_dir.exists() else []
 
-    # Get existing HF transcript files
-    try:
-        hf_tr = {f.rfilename for f in api.list_repo_tree(
-            "Adam429/podcast-transcripts", repo_type="dataset", path_in_repo="transcripts"
-        ) if hasattr(f, "rfilename")}
-    except Exception:
-        hf_tr = set()
-
     missing_tr = [f for f in local_files if f"transcripts/{f.name}" not in hf_tr]
     logger.info("Transcripts: %d local, %d on HF, %d missing", len(local_files), len(hf_tr), len(missing_tr))
 
-    for f in missing_tr:
-        api.upload_file(
-            path_or_fileobj=str(f),
-            path_in_repo=f"transcripts/{f.name}",
+    if missing_tr:
+        # One commit for the whole set instead of a commit round-trip per file
+        from huggingface_hub import CommitOperationAdd
+
+        api.create_commit(
             repo_id="Adam429/podcast-transcripts",
             repo_type="dataset",
-            commit_message=f"Sync: {f.name}",
+            operations=[
+                CommitOperationAdd(path_in_repo=f"transcripts/{f.name}", path_or_fileobj=str(f))
+                for f in missing_tr
+            ],
+            commit_message=f"Sync {len(missing_tr)} transcripts",
         )
-        logger.info("  Uploaded transcript: %s", f.name)
+        logger.info("  Uploaded %d transcripts", len(missing_tr))
 
     # --- Sync audio (ep1-10 missing) ---
-    # Get existing HF audio files
-    try:
-        hf_audio = {f.rfilename.split("/")[-1].split(".")[0] for f in api.list_repo_tree(
-            "Adam429/podcast-audio", repo_type="dataset", path_in_repo="audio"
-        ) if hasattr(f, "rfilename")}
-    except Exception:
-        hf_audio = set()
-
     # Get episode IDs that have transcripts
-    local_ids = {f.stem for f in transcript_dir.glob("*.json")} if transcript_dir.exists() else set()
+    local_ids = transcript_ids(transcript_dir)
     missing_audio_ids = local_ids - hf_audio
     logger.info("Audio: %d on HF, %d local episodes, %d missing audio", len(hf_audio), len(local_ids), len(missing_audio_ids))
 
@@ -87,20 +88,31 @@ def main() -> None:
         ]
 
         with audio_app.run():
-            for i, (result, ep) in enumerate(
-                zip(download_and_upload_audio.starmap(audio_args), missing_eps)
-            ):
-                try:
-                    logger.info(
-                        "[%d/%d] Audio uploaded: %s (%.1f MB)",
-                        i + 1, len(missing_eps), result["filename"], result["size_mb"],
+            results = download_and_upload_audio.starmap(audio_args, return_exceptions=True)
+            for i, (ep, result) in enumerate(zip(missing_eps, results), 1):
+                if isinstance(result, Exception):
+                    logger.error(
+                        "[%d/%d] Audio failed: %s (%s)", i, len(missing_eps), ep.episode_id, result,
                     )
-                except Exception:
-                    logger.exception("[%d/%d] Audio failed: %s", i + 1, len(missing_eps), ep.episode_id)
+                    continue
+                logger.info(
+                    "[%d/%d] Audio uploaded: %s (%.1f MB)",
+                    i, len(missing_eps), result["filename"], result["size_mb"],
+                )
 
     logger.info("Sync complete!")
 
 
+def _hf_files(api, repo_id: str, prefix: str) -> set[str]:
+    """Return repo file paths under prefix, or an empty set if listing fails."""
+    from src.publish.hub import cached_repo_files
+
+    try:
+        return {f for f in cached_repo_files(api, repo_id) if f.startswith(prefix)}
+    except Exception:
+        return set()
+
+
 def sync_proofread(api, hf_token: str) -> None:
     """Sync proofread files to HF."""
     proofread_dir = Path("data/proofread")
@@ -108,28 +120,29 @@ def sync_proofread(api, hf_token: str) -> None:
         return
 
     local_files = sorted(proofread_dir.glob("*.*"))
-    try:
-        hf_files = {f for f in api.list_repo_files(
-            "Adam429/podcast-transcripts", repo_type="dataset"
-        ) if f.startswith("proofread/")}
-    except Exception:
-        hf_files = set()
+    hf_files = _hf_files(api, "Adam429/podcast-transcripts", "proofread/")
 
     missing = [f for f in local_files if f"proofread/{f.name}" not in hf_files]
     logger.info("Proofread: %d local, %d on HF, %d missing", len(local_files), len(hf_files), len(missing))
 
-    for f in missing:
-        try:
-            api.upload_file(
-                path_or_fileobj=str(f),
-                path_in_repo=f"proofread/{f.name}",
-                repo_id="Adam429/podcast-transcripts",
-                repo_type="dataset",
-                commit_message=f"Sync proofread: {f.name}",
-            )
-            logger.info("  Uploaded: %s", f.name)
-        except Exception:
-            logger.exception("  Failed: %s", f.name)
+    if not missing:
+        return
+
+    from huggingface_hub import CommitOperationAdd
+
+    try:
+        api.create_commit(
+            repo_id="Adam429/podcast-transcripts",
+            repo_type="dataset",
+            operations=[
+                CommitOperationAdd(path_in_repo=f"proofread/{f.name}", path_or_fileobj=str(f))
+                for f in missing
+            ],
+            commit_message=f"Sync {len(missing)} proofread files",
+        )
+        logger.info("  Uploaded %d proofread files", len(missing))
+    except Exception:
+        logger.exception("  Failed to upload %d proofread files", len(missing))
 
 
 if __name__ == "__main__":
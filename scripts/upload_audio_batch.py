@@ -16,6 +16,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from src.ingest.filter import filter_episodes
 from src.ingest.rss import parse_feed
+from src.postprocess.manifest import transcript_ids
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
 logger = logging.getLogger("upload_audio")
@@ -40,16 +41,14 @@ def main() -> None:
     episodes = parse_feed(args.feed_url, max_episodes=0)
     episodes = filter_episodes(episodes)
 
-    transcript_ids = set()
-    if args.transcript_dir.exists():
-        transcript_ids = {f.stem for f in args.transcript_dir.glob("*.json")}
+    done_ids = transcript_ids(args.transcript_dir)
 
     # Only episodes WITH transcripts (we want to backfill their audio)
-    batch = [ep for ep in episodes if ep.episode_id in transcript_ids]
+    batch = [ep for ep in episodes if ep.episode_id in done_ids]
     batch.sort(key=lambda e: e.date)
     batch = batch[: args.batch_size]
 
-    logger.info("Found %d episodes with transcripts, uploading %d", len(transcript_ids), len(batch))
+    logger.info("Found %d episodes with transcripts, uploading %d", len(done_ids), len(batch))
 
     if args.dry_run:
         for ep in batch:
@@ -76,17 +75,17 @@ def main() -> None:
     logger.info("Launching %d audio uploads in parallel...", len(batch))
     success = 0
     with audio_app.run():
-        for i, (result, ep) in enumerate(
-            zip(download_and_upload_audio.starmap(audio_args), batch)
-        ):
-            try:
-                success += 1
-                logger.info(
-                    "[%d/%d] Uploaded: %s — %s (%.1f MB)",
-                    i + 1, len(batch), result["filename"], ep.title, result["size_mb"],
-                )
-            except Exception:
-                logger.exception("[%d/%d] Failed: %s", i + 1, len(batch), ep.episode_id)
+        # A failed upload comes back as an exception instead of ending the stream
+        results = download_and_upload_audio.starmap(audio_args, return_exceptions=True)
+        for i, (ep, result) in enumerate(zip(batch, results), 1):
+            if isinstance(result, Exception):
+                logger.error("[%d/%d] Failed: %s (%s)", i, len(batch), ep.episode_id, result)
+                continue
+            success += 1
+            logger.info(
+                "[%d/%d] Uploaded: %s — %s (%.1f MB)",
+                i, len(batch), result["filename"], ep.title, result["size_mb"],
+            )
 
     logger.info("Done: %d/%d uploaded", success, len(batch))
 
@@ -2,28 +2,36 @@
 """One-off: upload existing transcripts to HuggingFace."""
 import os, sys
 from pathlib import Path
-from huggingface_hub import HfApi
+from huggingface_hub import CommitOperationAdd, HfApi
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.publish.hub import configure_hf_session
 
 token = os.environ.get("HF_TOKEN", "")
 if not token:
     print("HF_TOKEN not set"); sys.exit(1)
 
+configure_hf_session()
 api = HfApi(token=token)
 api.create_repo("Adam429/podcast-transcripts", repo_type="dataset", exist_ok=True)
 
 transcript_dir = Path("data/transcripts")
-files = sorted(transcript_dir.glob("*.*"))
+files = sorted(f for f in transcript_dir.glob("*.*") if f.suffix in (".json", ".md"))
 print(f"Uploading {len(files)} files...")
 
-for f in files:
-    if f.suffix in (".json", ".md"):
-        api.upload_file(
-            path_or_fileobj=str(f),
-            path_in_repo=f"transcripts/{f.name}",
-            repo_id="Adam429/podcast-transcripts",
-            repo_type="dataset",
-            commit_message=f"Add transcript: {f.name}",
-        )
-        print(f"  ✅ {f.name}")
+# Bundle files into a few large commits instead of one commit per file
+COMMIT_SIZE = 100
+for start in range(0, len(files), COMMIT_SIZE):
+    chunk = files[start:start + COMMIT_SIZE]
+    api.create_commit(
+        repo_id="Adam429/podcast-transcripts",
+        repo_type="dataset",
+        operations=[
+            CommitOperationAdd(path_in_repo=f"transcripts/{f.name}", path_or_fileobj=str(f))
+            for f in chunk
+        ],
+        commit_message=f"Add {len(chunk)} transcripts",
+    )
+    print(f"  ✅ {start + len(chunk)}/{len(files)}")
 
 print("Done!")
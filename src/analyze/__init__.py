@@ -6,13 +6,22 @@ Uses Kimi K2.5 via api-proxy.
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import os
 import re
+from collections.abc import AsyncIterator
 from pathlib import Path
 
 import httpx
+import orjson
+
+try:
+    import json5  # optional: lets almost-JSON replies through without a re-ask
+except ImportError:
+    json5 = None
+
+from src.llm_client import LLMClient, budget_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +29,8 @@ DEFAULT_API_BASE = os.environ.get("API_BASE", "http://localhost:8180/v1")
 DEFAULT_API_KEY = os.environ.get("API_KEY", "sk-podcast-proofread")
 DEFAULT_MODEL = os.environ.get("ANALYZE_MODEL", "kimi-k2.5")
 
+_JSON_BLOCK_RE = re.compile(r"```(?:json)?\s*\n?(.*?)\n?```", re.DOTALL)
+
 SYSTEM_PROMPT = """你是一个播客内容分析专家。你将分析一档中文知识类播客《独树不成林》的单集文本。
 
 请从以下两个维度进行分析，输出严格的 JSON 格式。
@@ -82,9 +93,13 @@ def analyze_episode(
     model: str = DEFAULT_MODEL,
     timeout: float = 600.0,
     retries: int = 2,
+    use_cache: bool = True,
 ) -> dict:
     """Analyze a single episode: style + entities in one LLM call.
 
+    With use_cache, a reply for a byte-identical request is reused from
+    the src.llm_cache disk cache instead of calling the LLM again.
+
     Returns:
         {
             "style": {...},
@@ -94,72 +109,105 @@ def analyze_episode(
             "title": str,
         }
     """
+    llm = LLMClient(api_base, api_key, timeout=timeout, retries=retries, use_cache=use_cache)
+    payload = _build_payload(text, title, model)
+    return _parse_or_forget(llm, payload, llm.complete(payload), episode_id, title)
+
+
+async def analyze_episode_async(
+    text: str,
+    title: str = "",
+    episode_id: str = "",
+    api_base: str = DEFAULT_API_BASE,
+    api_key: str = DEFAULT_API_KEY,
+    model: str = DEFAULT_MODEL,
+    timeout: float = 600.0,
+    retries: int = 2,
+    use_cache: bool = True,
+    client: httpx.AsyncClient | None = None,
+) -> dict:
+    """Async variant of analyze_episode.
+
+    Pass a shared ``client`` to reuse connections across many concurrent calls.
+    """
+    llm = LLMClient(api_base, api_key, timeout=timeout, retries=retries, use_cache=use_cache)
+    payload = _build_payload(text, title, model)
+    content = await llm.complete_async(payload, client=client)
+    return _parse_or_forget(llm, payload, content, episode_id, title)
+
+
+def _build_payload(text: str, title: str, model: str) -> dict:
+    """Chat-completions request body for one episode."""
     user_msg = f"标题：{title}\n\n以下是播客文本：\n\n{text}"
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_msg},
+        ],
+        "temperature": 0.1,
+        # Style notes + entity list: grows with the text but stays well under its length
+        "max_tokens": budget_tokens(text, 8192, per_char=0.5),
+    }
+
+
+def _parse_or_forget(
+    llm: LLMClient, payload: dict, content: str, episode_id: str, title: str
+) -> dict:
+    """Parse a reply, evicting it from the cache if unparseable (worth asking again)."""
+    data = _parse_response(content, payload["model"], episode_id, title)
+    if data.get("parse_error"):
+        llm.forget(payload)
+    return data
 
-    last_err = None
-    for attempt in range(1 + retries):
-        try:
-            with httpx.Client(timeout=timeout) as client:
-                resp = client.post(
-                    f"{api_base}/chat/completions",
-                    headers={"Authorization": f"Bearer {api_key}"},
-                    json={
-                        "model": model,
-                        "messages": [
-                            {"role": "system", "content": SYSTEM_PROMPT},
-                            {"role": "user", "content": user_msg},
-                        ],
-                        "temperature": 0.1,
-                        "max_tokens": 8192,
-                    },
-                )
-                resp.raise_for_status()
-                content = resp.json()["choices"][0]["message"]["content"]
-            return _parse_response(content, model, episode_id, title)
-        except (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.RemoteProtocolError) as e:
-            last_err = e
-            if attempt < retries:
-                import time
-                wait = 10 * (attempt + 1)
-                logger.warning("Attempt %d/%d failed (%s), retrying in %ds...", attempt + 1, 1 + retries, e, wait)
-                time.sleep(wait)
-    raise last_err  # type: ignore[misc]
+
+def _loads_relaxed(json_str: str):
+    """Decode JSON, tolerating trailing commas, comments etc. when json5 is installed."""
+    try:
+        return orjson.loads(json_str)
+    except orjson.JSONDecodeError:
+        if json5 is None:
+            raise
+        return json5.loads(json_str)
+
+
+def _outer_object(json_str: str) -> str | None:
+    """The first balanced {...} span in json_str, or None if there is none."""
+    start = json_str.find("{")
+    if start < 0:
+        return None
+    depth = 0
+    for i, ch in enumerate(json_str[start:], start):
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return json_str[start:i + 1]
+    return None
 
 
 def _parse_response(content: str, model: str, episode_id: str, title: str) -> dict:
     """Parse LLM JSON response."""
     # Extract JSON from markdown code block if present
-    json_match = re.search(r"```(?:json)?\s*\n?(.*?)\n?```", content, re.DOTALL)
+    json_match = _JSON_BLOCK_RE.search(content)
     if json_match:
         json_str = json_match.group(1).strip()
     else:
         json_str = content.strip()
 
-    # Try parsing as-is first
     try:
-        data = json.loads(json_str)
-    except json.JSONDecodeError:
-        # Try to find the outermost JSON object with brace matching
-        start = json_str.find("{")
-        if start >= 0:
-            depth = 0
-            end = start
-            for i, ch in enumerate(json_str[start:], start):
-                if ch == "{":
-                    depth += 1
-                elif ch == "}":
-                    depth -= 1
-                    if depth == 0:
-                        end = i + 1
-                        break
-            try:
-                data = json.loads(json_str[start:end])
-            except json.JSONDecodeError:
-                logger.error("Failed to parse JSON for %s. Raw (first 500): %s", episode_id, json_str[:500])
-                data = {"style": {}, "entities": [], "parse_error": True}
-        else:
-            logger.error("No JSON object found for %s. Raw (first 500): %s", episode_id, json_str[:500])
-            data = {"style": {}, "entities": [], "parse_error": True}
+        data = _loads_relaxed(json_str)
+    except ValueError:
+        # Fall back to the outermost balanced {...}, dropping any prose around it
+        obj_str = _outer_object(json_str)
+        try:
+            data = _loads_relaxed(obj_str) if obj_str else None
+        except ValueError:
+            data = None
+
+    if not isinstance(data, dict):
+        logger.error("Failed to parse JSON for %s. Raw (first 500): %s", episode_id, json_str[:500])
         data = {"style": {}, "entities": [], "parse_error": True}
 
     data["model"] = model
@@ -173,6 +221,7 @@ def analyze_transcript(
     output_dir: Path | None = None,
     use_proofread: bool = True,
     proofread_dir: Path | None = None,
+    pretty_json: bool = False,
     **kwargs,
 ) -> dict:
     """Analyze a transcript file (or its proofread version).
@@ -182,25 +231,10 @@ def analyze_transcript(
         output_dir: Where to save analysis results.
         use_proofread: If True, prefer proofread text over original.
         proofread_dir: Directory containing proofread JSONs.
+        pretty_json: Indent the saved JSON (compact by default).
     """
     episode_id = transcript_path.stem
-
-    # Prefer proofread text
-    text = ""
-    title = ""
-    if use_proofread and proofread_dir:
-        pr_path = proofread_dir / f"{episode_id}.json"
-        if pr_path.exists():
-            with open(pr_path) as f:
-                data = json.load(f)
-            text = data.get("transcription", "")
-            title = data.get("title", "")
-
-    if not text:
-        with open(transcript_path) as f:
-            data = json.load(f)
-        text = data.get("transcription", "")
-        title = data.get("title", "")
+    text, title = _load_text(transcript_path, use_proofread, proofread_dir)
 
     if not text or len(text) < 50:
         logger.warning("Skipping %s: text too short (%d chars)", episode_id, len(text))
@@ -208,15 +242,101 @@ def analyze_transcript(
 
     logger.info("Analyzing: %s — %s (%d chars)", episode_id, title, len(text))
     result = analyze_episode(text, title=title, episode_id=episode_id, **kwargs)
+    _save_result(result, transcript_path, output_dir, pretty_json)
+    return result
+
+
+async def analyze_transcript_async(
+    transcript_path: Path,
+    output_dir: Path | None = None,
+    use_proofread: bool = True,
+    proofread_dir: Path | None = None,
+    pretty_json: bool = False,
+    **kwargs,
+) -> dict:
+    """Async variant of analyze_transcript; kwargs go to analyze_episode_async."""
+    episode_id = transcript_path.stem
+    text, title = _load_text(transcript_path, use_proofread, proofread_dir)
+
+    if not text or len(text) < 50:
+        logger.warning("Skipping %s: text too short (%d chars)", episode_id, len(text))
+        return {"episode_id": episode_id, "skipped": True}
 
-    # Save
+    logger.info("Analyzing: %s — %s (%d chars)", episode_id, title, len(text))
+    result = await analyze_episode_async(text, title=title, episode_id=episode_id, **kwargs)
+    _save_result(result, transcript_path, output_dir, pretty_json)
+    return result
+
+
+async def analyze_transcripts_async(
+    transcript_paths: list[Path],
+    concurrency: int = 16,
+    timeout: float = 600.0,
+    **kwargs,
+) -> AsyncIterator[tuple[Path, dict | Exception]]:
+    """Analyze many transcripts concurrently, yielding (path, result) as each finishes.
+
+    At most ``concurrency`` requests are in flight, all sharing one pooled
+    client. A failed episode yields its exception instead of aborting the batch;
+    logging it is left to the caller. kwargs go to analyze_transcript_async.
+    """
+    sem = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+
+        async def one(path: Path) -> tuple[Path, dict | Exception]:
+            async with sem:
+                try:
+                    return path, await analyze_transcript_async(
+                        path, client=client, timeout=timeout, **kwargs
+                    )
+                except Exception as e:
+                    return path, e
+
+        for next_done in asyncio.as_completed([one(p) for p in transcript_paths]):
+            yield await next_done
+
+
+def analyze_transcripts(
+    transcript_paths: list[Path], concurrency: int = 16, **kwargs
+) -> list[tuple[Path, dict | Exception]]:
+    """Blocking wrapper around analyze_transcripts_async; results in completion order."""
+
+    async def collect() -> list[tuple[Path, dict | Exception]]:
+        return [r async for r in analyze_transcripts_async(transcript_paths, concurrency, **kwargs)]
+
+    return asyncio.run(collect())
+
+
+def _load_text_and_title(path: Path) -> tuple[str, str]:
+    """Return (transcription, title) from a transcript JSON file."""
+    data = orjson.loads(path.read_bytes())
+    return data.get("transcription", ""), data.get("title", "")
+
+
+def _load_text(
+    transcript_path: Path, use_proofread: bool, proofread_dir: Path | None
+) -> tuple[str, str]:
+    """Return (text, title), preferring the proofread version when available."""
+    if use_proofread and proofread_dir:
+        try:
+            text, title = _load_text_and_title(proofread_dir / f"{transcript_path.stem}.json")
+        except FileNotFoundError:
+            text = ""
+        if text:
+            return text, title
+
+    return _load_text_and_title(transcript_path)
+
+
+def _save_result(
+    result: dict, transcript_path: Path, output_dir: Path | None, pretty_json: bool = False
+) -> None:
     out_dir = output_dir or transcript_path.parent
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    out_path = out_dir / f"{episode_id}.json"
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+    out_path = out_dir / f"{transcript_path.stem}.json"
+    out_path.write_bytes(orjson.dumps(result, option=orjson.OPT_INDENT_2 if pretty_json else None))
 
     entity_count = len(result.get("entities", []))
     logger.info("  Done: %d entities, saved to %s", entity_count, out_path)
-    return result
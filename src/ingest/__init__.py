@@ -1,5 +1,7 @@
+from src.ingest.feed_cache import load_or_refresh as load_or_refresh
 from src.ingest.filter import filter_episodes as filter_episodes
 from src.ingest.filter import is_dialogue as is_dialogue
 from src.ingest.filter import is_paid_or_preview as is_paid_or_preview
 from src.ingest.rss import build_rss_url as build_rss_url
 from src.ingest.rss import parse_feed as parse_feed
+from src.ingest.rss import parse_feeds as parse_feeds
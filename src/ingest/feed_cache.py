@@ -0,0 +1,80 @@
+"""On-disk cache of parsed RSS feeds, revalidated with conditional GETs.
+
+The full feed is a multi-MB XML download plus a feedparser pass, yet it
+rarely changes between runs. Parsed episodes are cached together with the
+feed's ETag / Last-Modified, and the next fetch sends them back as
+If-None-Match / If-Modified-Since; a 304 reuses the cached episodes.
+Within one process a feed is fetched at most once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from dataclasses import asdict
+from pathlib import Path
+
+import feedparser
+import orjson
+
+from src.ingest.rss import build_rss_url, episodes_from_feed
+from src.models import Episode
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(".cache/feeds")
+
+# Feed URL -> episodes already loaded in this process
+_memo: dict[str, list[Episode]] = {}
+
+
+def _cache_path(cache_dir: Path, url: str) -> Path:
+    return cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()[:16]}.json"
+
+
+def load_or_refresh(
+    podcast_id: str,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+) -> list[Episode]:
+    """Return all episodes of a feed, refetching only when it has changed.
+
+    Args:
+        podcast_id: Xiaoyuzhou podcast ID or full RSS URL.
+        cache_dir: Where parsed feeds are cached, one JSON file per URL.
+
+    Returns:
+        List of Episode objects sorted by date descending.
+    """
+    url = build_rss_url(podcast_id)
+    if url in _memo:
+        return list(_memo[url])
+
+    path = _cache_path(cache_dir, url)
+    try:
+        cached = orjson.loads(path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        cached = {}
+
+    logger.info("Fetching RSS feed: %s", url)
+    feed = feedparser.parse(url, etag=cached.get("etag"), modified=cached.get("modified"))
+
+    if cached and feed.get("status") == 304:
+        logger.info("Feed not modified, using %d cached episodes", len(cached["episodes"]))
+        _memo[url] = [Episode(**ep) for ep in cached["episodes"]]
+        return list(_memo[url])
+
+    episodes = episodes_from_feed(feed, podcast_id)
+    logger.info("Parsed %d episodes from feed", len(episodes))
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_bytes(orjson.dumps({
+        "url": url,
+        "etag": feed.get("etag"),
+        "modified": feed.get("modified"),
+        "episodes": [asdict(ep) for ep in episodes],
+    }))
+    os.replace(tmp, path)
+    _memo[url] = episodes
+    return list(episodes)
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import logging
 import re
+from bisect import bisect_right
 
 from src.models import Episode
 
@@ -19,8 +20,22 @@ MIN_AUDIO_BYTES = 1_000_000  # 1 MB
 MIN_DURATION_SECONDS = 60  # 1 minute
 
 # Chinese keywords indicating conversation/interview format.
-# Matches: 对话, 对谈, 访谈, 聊聊, 圆桌, 连麦, 串台, 嘉宾, 特邀, 专访, 做客
-DIALOGUE_KEYWORDS = re.compile(r"对话|对谈|访谈|聊聊|圆桌|连麦|串台|嘉宾|特邀|专访|做客")
+DIALOGUE_WORDS = (
+    "对话", "对谈", "访谈", "聊聊", "圆桌", "连麦", "串台", "嘉宾", "特邀", "专访", "做客",
+)
+DIALOGUE_KEYWORDS = re.compile("|".join(DIALOGUE_WORDS))
+
+# With pyahocorasick installed, titles are scanned by a prebuilt automaton in
+# one pass instead of trying every alternative at each character.
+try:
+    import ahocorasick
+except ImportError:
+    _DIALOGUE_AUTOMATON = None
+else:
+    _DIALOGUE_AUTOMATON = ahocorasick.Automaton()
+    for _word in DIALOGUE_WORDS:
+        _DIALOGUE_AUTOMATON.add_word(_word, _word)
+    _DIALOGUE_AUTOMATON.make_automaton()
 
 # Titles indicating non-standard episodes (intro, trailer, bonus, etc.)
 SPECIAL_KEYWORDS = re.compile(r"^0-|播客介绍|预告|trailer|bonus", re.IGNORECASE)
@@ -43,12 +58,37 @@ def is_paid_or_preview(episode: Episode) -> bool:
 
 def is_dialogue(episode: Episode) -> bool:
     """Return True if the episode title suggests a conversation format."""
-    if DIALOGUE_KEYWORDS.search(episode.title):
+    if _DIALOGUE_AUTOMATON is not None:
+        hit = next(_DIALOGUE_AUTOMATON.iter(episode.title), None) is not None
+    else:
+        hit = DIALOGUE_KEYWORDS.search(episode.title) is not None
+    if hit:
         logger.debug("Filtered (dialogue keyword): %s", episode.title)
         return True
     return False
 
 
+def _dialogue_hits(titles: list[str]) -> set[int]:
+    """Indices of titles containing a dialogue keyword, found in one scan.
+
+    The titles are joined with newlines (no keyword contains one, so no
+    match can straddle two titles) and scanned once; match offsets are
+    mapped back to title indices.
+    """
+    starts = []
+    offset = 0
+    for title in titles:
+        starts.append(offset)
+        offset += len(title) + 1
+    joined = "\n".join(titles)
+
+    if _DIALOGUE_AUTOMATON is not None:
+        ends = (end for end, _ in _DIALOGUE_AUTOMATON.iter(joined))
+    else:
+        ends = (m.end() - 1 for m in DIALOGUE_KEYWORDS.finditer(joined))
+    return {bisect_right(starts, end) - 1 for end in ends}
+
+
 def is_special(episode: Episode) -> bool:
     """Return True if the episode is a special/intro/trailer episode."""
     if SPECIAL_KEYWORDS.search(episode.title):
@@ -80,11 +120,14 @@ def filter_episodes(
     dialogue_count = 0
     special_count = 0
 
-    for ep in episodes:
+    dialogue = _dialogue_hits([ep.title for ep in episodes]) if skip_dialogue else set()
+
+    for i, ep in enumerate(episodes):
         if skip_paid and is_paid_or_preview(ep):
             paid_count += 1
             continue
-        if skip_dialogue and is_dialogue(ep):
+        if i in dialogue:
+            logger.debug("Filtered (dialogue keyword): %s", ep.title)
             dialogue_count += 1
             continue
         if skip_special and is_special(ep):
@@ -13,6 +13,7 @@ from __future__ import annotations
 import hashlib
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import feedparser
@@ -23,6 +24,9 @@ logger = logging.getLogger(__name__)
 
 XIAOYUZHOU_RSS_TEMPLATE = "https://api.xiaoyuzhoufm.com/v1/podcast/rss/{podcast_id}"
 
+# Xiaoyuzhou guids look like full URLs ending in a 24-hex episode ID
+_GUID_ID_RE = re.compile(r"[a-f0-9]{24}$")
+
 
 def build_rss_url(podcast_id: str) -> str:
     """Build the RSS feed URL for a Xiaoyuzhou podcast.
@@ -79,8 +83,7 @@ def _episode_id(entry: dict, podcast_id: str) -> str:
     """
     guid = entry.get("id", "")
     if guid:
-        # Xiaoyuzhou guids look like full URLs; extract the trailing ID
-        match = re.search(r"[a-f0-9]{24}$", guid)
+        match = _GUID_ID_RE.search(guid)
         if match:
             return match.group(0)
         return hashlib.sha256(guid.encode()).hexdigest()[:16]
@@ -88,20 +91,50 @@ def _episode_id(entry: dict, podcast_id: str) -> str:
     return hashlib.sha256(fallback.encode()).hexdigest()[:16]
 
 
-def parse_feed(podcast_id: str, max_episodes: int = 0) -> list[Episode]:
+def parse_feed(podcast_id: str, max_episodes: int = 0, use_cache: bool = True) -> list[Episode]:
     """Parse a Xiaoyuzhou RSS feed and return a list of Episodes.
 
     Args:
         podcast_id: Xiaoyuzhou podcast ID or full RSS URL.
         max_episodes: Limit the number of episodes returned (0 = all).
+        use_cache: Go through src.ingest.feed_cache (conditional GET, reused
+            within the process) instead of always downloading the feed.
 
     Returns:
         List of Episode objects sorted by date descending.
     """
+    if use_cache:
+        from src.ingest.feed_cache import load_or_refresh
+
+        episodes = load_or_refresh(podcast_id)
+        return episodes[:max_episodes] if max_episodes > 0 else episodes
+
     url = build_rss_url(podcast_id)
     logger.info("Fetching RSS feed: %s", url)
-    feed = feedparser.parse(url)
+    episodes = episodes_from_feed(feedparser.parse(url), podcast_id)
+
+    if max_episodes > 0:
+        episodes = episodes[:max_episodes]
+
+    logger.info("Parsed %d episodes from feed", len(episodes))
+    return episodes
+
 
+def parse_feeds(
+    podcast_ids: list[str], max_episodes: int = 0, max_workers: int = 8
+) -> dict[str, list[Episode]]:
+    """Parse several feeds concurrently; returns {podcast_id: episodes}.
+
+    Fetching dominates and feedparser releases the GIL while waiting on the
+    network, so N feeds take about as long as the slowest one.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = pool.map(lambda pid: parse_feed(pid, max_episodes=max_episodes), podcast_ids)
+        return dict(zip(podcast_ids, results))
+
+
+def episodes_from_feed(feed, podcast_id: str) -> list[Episode]:
+    """Turn a parsed feedparser result into Episodes sorted by date descending."""
     if feed.bozo and not feed.entries:
         raise ValueError(f"Failed to parse RSS feed: {feed.bozo_exception}")
 
@@ -127,9 +160,4 @@ def parse_feed(podcast_id: str, max_episodes: int = 0) -> list[Episode]:
         episodes.append(ep)
 
     episodes.sort(key=lambda e: e.date, reverse=True)
-
-    if max_episodes > 0:
-        episodes = episodes[:max_episodes]
-
-    logger.info("Parsed %d episodes from feed", len(episodes))
     return episodes
@@ -0,0 +1,47 @@
+"""Content-addressed disk cache for LLM replies.
+
+Keyed by a hash of the full request payload (model, prompts, sampling
+parameters), so re-running analyze/proofread over unchanged text returns
+the previous reply without calling the api-proxy.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+import orjson
+
+CACHE_DIR = Path(os.environ.get("LLM_CACHE_DIR", ".cache/llm"))
+
+
+def cache_key(payload: dict) -> str:
+    """Stable SHA-256 of a chat-completions payload."""
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _cache_path(key: str) -> Path:
+    return CACHE_DIR / key[:2] / f"{key}.json"
+
+
+def cache_get(key: str) -> str | None:
+    """Return the cached reply content, or None on a miss."""
+    try:
+        return orjson.loads(_cache_path(key).read_bytes())["content"]
+    except (OSError, orjson.JSONDecodeError, KeyError):
+        return None
+
+
+def cache_put(key: str, content: str) -> None:
+    """Store a reply's content under key (atomic, last writer wins)."""
+    path = _cache_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(orjson.dumps({"content": content}))
+    os.replace(tmp, path)
+
+
+def cache_delete(key: str) -> None:
+    """Drop a cached reply, e.g. one that turned out to be unusable."""
+    _cache_path(key).unlink(missing_ok=True)
@@ -0,0 +1,298 @@
+"""Shared HTTP plumbing for the OpenAI-compatible api-proxy.
+
+Used by src.analyze and src.proofread so every LLM request in a process
+rides the same pool of keep-alive connections instead of paying a fresh
+TCP/TLS handshake per call, and so both retry the same way: transient
+network errors and 429/5xx responses back off exponentially with jitter,
+honouring Retry-After when the proxy sends one.
+
+Long completions can be streamed (``"stream": true``): the reply arrives
+as server-sent events and only the content deltas are kept, instead of
+waiting for and decoding one large response body.
+
+LLMClient bundles one endpoint's settings with the reply cache so callers
+just hand it a chat-completions payload and get the content back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from functools import lru_cache
+
+import httpx
+import orjson
+
+from src.llm_cache import cache_delete, cache_get, cache_key, cache_put
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+RETRY_EXCEPTIONS = (httpx.TimeoutException, httpx.RemoteProtocolError, httpx.ConnectError)
+MAX_BACKOFF = 60.0
+
+
+@lru_cache(maxsize=1)
+def get_client() -> httpx.Client:
+    """Return the process-wide pooled client (created on first use).
+
+    Auth headers and timeouts are passed per request, so one client serves
+    every api_base / api_key combination.
+    """
+    limits = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+    # Transport-level retries only cover failed connects; the rest is post_with_retry
+    return httpx.Client(timeout=600.0, transport=httpx.HTTPTransport(limits=limits, retries=2))
+
+
+def budget_tokens(text: str, cap: int, per_char: float = 1.0, overhead: int = 1024) -> int:
+    """max_tokens sized to the input: per_char tokens per input char + overhead.
+
+    Chinese text is roughly one token per character, so short episodes
+    don't reserve (and risk running away into) the full cap. The result
+    never drops below cap // 2: reasoning models spend part of max_tokens
+    before writing the reply, and a tight budget truncates it.
+    """
+    return max(cap // 2, min(cap, int(len(text) * per_char) + overhead))
+
+
+def _backoff(attempt: int, resp: httpx.Response | None = None) -> float:
+    """Seconds to wait before retry number attempt + 1."""
+    if resp is not None:
+        try:
+            return min(MAX_BACKOFF, float(resp.headers["Retry-After"]))
+        except (KeyError, ValueError):
+            pass
+    return min(MAX_BACKOFF, 2**attempt + random.uniform(0, 1))
+
+
+def _retry_wait(attempt: int, retries: int, exc: Exception) -> float | None:
+    """Return the backoff for a retryable failure, or None to give up."""
+    if attempt >= retries:
+        return None
+    if isinstance(exc, httpx.HTTPStatusError):
+        if exc.response.status_code not in RETRY_STATUS:
+            return None
+        wait = _backoff(attempt, exc.response)
+    elif isinstance(exc, RETRY_EXCEPTIONS):
+        wait = _backoff(attempt)
+    else:
+        return None
+    logger.warning(
+        "Attempt %d/%d failed (%s), retrying in %.1fs...", attempt + 1, 1 + retries, exc, wait
+    )
+    return wait
+
+
+def post_with_retry(
+    url: str,
+    payload: dict,
+    api_key: str,
+    timeout: float = 600.0,
+    retries: int = 2,
+) -> dict:
+    """POST a JSON payload with the shared client and return the decoded reply."""
+    for attempt in range(1 + retries):
+        try:
+            resp = get_client().post(
+                url,
+                headers={"Authorization": f"Bearer {api_key}"},
+                json=payload,
+                timeout=timeout,
+            )
+            resp.raise_for_status()
+            return resp.json()
+        except (httpx.HTTPStatusError, *RETRY_EXCEPTIONS) as e:
+            wait = _retry_wait(attempt, retries, e)
+            if wait is None:
+                raise
+            time.sleep(wait)
+    raise AssertionError("unreachable")
+
+
+async def post_with_retry_async(
+    client: httpx.AsyncClient,
+    url: str,
+    payload: dict,
+    api_key: str,
+    timeout: float = 600.0,
+    retries: int = 2,
+) -> dict:
+    """Async variant of post_with_retry on a caller-provided client."""
+    for attempt in range(1 + retries):
+        try:
+            resp = await client.post(
+                url,
+                headers={"Authorization": f"Bearer {api_key}"},
+                json=payload,
+                timeout=timeout,
+            )
+            resp.raise_for_status()
+            return resp.json()
+        except (httpx.HTTPStatusError, *RETRY_EXCEPTIONS) as e:
+            wait = _retry_wait(attempt, retries, e)
+            if wait is None:
+                raise
+            await asyncio.sleep(wait)
+    raise AssertionError("unreachable")
+
+
+def _sse_delta(line: str) -> str | None:
+    """Content carried by one event-stream line ("" if none), or None at [DONE]."""
+    if not line.startswith("data:"):
+        return ""
+    data = line[5:].strip()
+    if data == "[DONE]":
+        return None
+    choices = orjson.loads(data).get("choices") or ()
+    return (choices[0].get("delta", {}).get("content") or "") if choices else ""
+
+
+def stream_with_retry(
+    url: str,
+    payload: dict,
+    api_key: str,
+    timeout: float = 600.0,
+    retries: int = 2,
+) -> str:
+    """Stream a chat completion with the shared client and return its full content."""
+    for attempt in range(1 + retries):
+        try:
+            with get_client().stream(
+                "POST",
+                url,
+                headers={"Authorization": f"Bearer {api_key}"},
+                json={**payload, "stream": True},
+                timeout=timeout,
+            ) as resp:
+                if resp.is_error:
+                    resp.read()
+                    resp.raise_for_status()
+                pieces = []
+                for line in resp.iter_lines():
+                    piece = _sse_delta(line)
+                    if piece is None:
+                        break
+                    pieces.append(piece)
+                return "".join(pieces)
+        except (httpx.HTTPStatusError, *RETRY_EXCEPTIONS) as e:
+            wait = _retry_wait(attempt, retries, e)
+            if wait is None:
+                raise
+            time.sleep(wait)
+    raise AssertionError("unreachable")
+
+
+async def stream_with_retry_async(
+    client: httpx.AsyncClient,
+    url: str,
+    payload: dict,
+    api_key: str,
+    timeout: float = 600.0,
+    retries: int = 2,
+) -> str:
+    """Async variant of stream_with_retry on a caller-provided client."""
+    for attempt in range(1 + retries):
+        try:
+            async with client.stream(
+                "POST",
+                url,
+                headers={"Authorization": f"Bearer {api_key}"},
+                json={**payload, "stream": True},
+                timeout=timeout,
+            ) as resp:
+                if resp.is_error:
+                    await resp.aread()
+                    resp.raise_for_status()
+                pieces = []
+                async for line in resp.aiter_lines():
+                    piece = _sse_delta(line)
+                    if piece is None:
+                        break
+                    pieces.append(piece)
+                return "".join(pieces)
+        except (httpx.HTTPStatusError, *RETRY_EXCEPTIONS) as e:
+            wait = _retry_wait(attempt, retries, e)
+            if wait is None:
+                raise
+            await asyncio.sleep(wait)
+    raise AssertionError("unreachable")
+
+
+class LLMClient:
+    """Chat completions against one api-proxy endpoint, with retries and caching.
+
+    Sync calls go through the shared pooled client from get_client(); async
+    calls use the AsyncClient passed in (or a throwaway one). With use_cache,
+    replies are stored in src.llm_cache keyed by the payload.
+    """
+
+    def __init__(
+        self,
+        api_base: str,
+        api_key: str,
+        timeout: float = 600.0,
+        retries: int = 2,
+        use_cache: bool = True,
+    ) -> None:
+        self.url = f"{api_base}/chat/completions"
+        self.api_key = api_key
+        self.timeout = timeout
+        self.retries = retries
+        self.use_cache = use_cache
+
+    def complete(self, payload: dict, stream: bool = False) -> str:
+        """Return the reply content for a chat-completions payload."""
+        key = cache_key(payload)
+        content = cache_get(key) if self.use_cache else None
+        if content is not None:
+            return content
+        if stream:
+            content = stream_with_retry(
+                self.url, payload, self.api_key, timeout=self.timeout, retries=self.retries
+            )
+        else:
+            reply = post_with_retry(
+                self.url, payload, self.api_key, timeout=self.timeout, retries=self.retries
+            )
+            content = reply["choices"][0]["message"]["content"]
+        cache_put(key, content)
+        return content
+
+    async def complete_async(
+        self,
+        payload: dict,
+        stream: bool = False,
+        client: httpx.AsyncClient | None = None,
+    ) -> str:
+        """Async variant of complete; pass a shared client to reuse connections."""
+        key = cache_key(payload)
+        content = cache_get(key) if self.use_cache else None
+        if content is not None:
+            return content
+
+        own_client = client is None
+        if own_client:
+            client = httpx.AsyncClient(timeout=self.timeout)
+        try:
+            if stream:
+                content = await stream_with_retry_async(
+                    client, self.url, payload, self.api_key,
+                    timeout=self.timeout, retries=self.retries,
+                )
+            else:
+                reply = await post_with_retry_async(
+                    client, self.url, payload, self.api_key,
+                    timeout=self.timeout, retries=self.retries,
+                )
+                content = reply["choices"][0]["message"]["content"]
+        finally:
+            if own_client:
+                await client.aclose()
+        cache_put(key, content)
+        return content
+
+    def forget(self, payload: dict) -> None:
+        """Evict the cached reply for payload so the next call asks again."""
+        cache_delete(cache_key(payload))
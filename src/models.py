@@ -2,9 +2,22 @@
 
 from __future__ import annotations
 
-import json
+import io
+import os
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from typing import TextIO
+
+import orjson
+
+
+def count_words(text: str) -> int:
+    """Word count as the pipeline reports it: characters other than spaces.
+
+    For Chinese text each character is a word. str.count runs in C without
+    copying the text, which is as fast as this gets.
+    """
+    return len(text) - text.count(" ")
 
 
 @dataclass
@@ -40,36 +53,63 @@ class TranscriptionResult:
 
     def __post_init__(self) -> None:
         if self.word_count == 0 and self.transcription:
-            self.word_count = len(self.transcription.replace(" ", ""))
+            self.word_count = count_words(self.transcription)
+
+    def segment_columns(self) -> dict[str, list]:
+        """Segments as parallel start/end/text lists, for column-wise scans."""
+        return {
+            "start": [seg["start"] for seg in self.segments],
+            "end": [seg["end"] for seg in self.segments],
+            "text": [seg["text"] for seg in self.segments],
+        }
 
     def to_json(self, path: Path | None = None) -> str:
-        """Serialize to JSON string. Optionally write to file."""
-        data = asdict(self)
-        text = json.dumps(data, ensure_ascii=False, indent=2)
+        """Serialize to JSON string. Optionally write to file.
+
+        The file is written via a temp file + rename so a crash never
+        leaves a half-written transcript behind.
+        """
+        raw = orjson.dumps(asdict(self), option=orjson.OPT_INDENT_2)
         if path:
             path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(text, encoding="utf-8")
-        return text
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_bytes(raw)
+            os.replace(tmp, path)
+        return raw.decode("utf-8")
 
     def to_markdown(self, path: Path | None = None) -> str:
-        """Render a human-readable Markdown transcript."""
-        lines = [
-            f"# {self.title}",
-            "",
-            f"- **Episode ID**: {self.episode_id}",
-            f"- **Date**: {self.date}",
-            f"- **Duration**: {self.duration:.0f}s ({self.duration / 60:.1f} min)",
-            f"- **Word count**: {self.word_count}",
-            f"- **Language**: {self.language}",
-            f"- **Model**: {self.model}",
-            "",
-            "---",
-            "",
-            self.transcription,
-            "",
-        ]
-        text = "\n".join(lines)
+        """Render a human-readable Markdown transcript. Optionally write to file."""
+        buf = io.StringIO()
+        self._write_markdown(buf)
+        text = buf.getvalue()
         if path:
             path.parent.mkdir(parents=True, exist_ok=True)
             path.write_text(text, encoding="utf-8")
         return text
+
+    def write_markdown(self, path: Path) -> None:
+        """Stream the Markdown transcript straight to path.
+
+        Unlike to_markdown(path), a multi-MB transcript is never copied into
+        a second string.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as f:
+            self._write_markdown(f)
+
+    def _write_markdown(self, f: TextIO) -> None:
+        f.write(
+            f"# {self.title}\n"
+            "\n"
+            f"- **Episode ID**: {self.episode_id}\n"
+            f"- **Date**: {self.date}\n"
+            f"- **Duration**: {self.duration:.0f}s ({self.duration / 60:.1f} min)\n"
+            f"- **Word count**: {self.word_count}\n"
+            f"- **Language**: {self.language}\n"
+            f"- **Model**: {self.model}\n"
+            "\n"
+            "---\n"
+            "\n"
+        )
+        f.write(self.transcription)
+        f.write("\n")
@@ -1,3 +1,4 @@
 from src.postprocess.formatter import dict_to_result as dict_to_result
 from src.postprocess.formatter import save_batch as save_batch
 from src.postprocess.formatter import save_transcript as save_transcript
+from src.postprocess.manifest import transcript_ids as transcript_ids
@@ -7,8 +7,12 @@ to the data/transcripts/ directory, ready for HuggingFace Dataset sync.
 from __future__ import annotations
 
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import orjson
+
 from src.models import TranscriptionResult
 
 logger = logging.getLogger(__name__)
@@ -16,6 +20,16 @@ logger = logging.getLogger(__name__)
 DEFAULT_OUTPUT_DIR = Path("data/transcripts")
 
 
+def _segment_rows(segments: list[dict] | dict[str, list]) -> list[dict]:
+    """Accept segments as a list of dicts or as start/end/text columns."""
+    if isinstance(segments, dict):
+        return [
+            {"start": s, "end": e, "text": t}
+            for s, e, t in zip(segments["start"], segments["end"], segments["text"])
+        ]
+    return segments
+
+
 def dict_to_result(raw: dict) -> TranscriptionResult:
     """Convert a raw dict (from Modal JSON) into a TranscriptionResult."""
     return TranscriptionResult(
@@ -25,45 +39,69 @@ def dict_to_result(raw: dict) -> TranscriptionResult:
         duration=raw.get("duration", 0.0),
         transcription=raw.get("transcription", ""),
         word_count=raw.get("word_count", 0),
-        segments=raw.get("segments", []),
+        segments=_segment_rows(raw.get("segments", [])),
         language=raw.get("language", "zh"),
         model=raw.get("model", "large-v3"),
     )
 
 
 def save_transcript(
-    result: TranscriptionResult | dict,
+    result: TranscriptionResult | dict | bytes,
     output_dir: Path = DEFAULT_OUTPUT_DIR,
+    _ensure_dir: bool = True,
 ) -> tuple[Path, Path]:
     """Write both JSON and Markdown files for a transcription result.
 
     File naming: {episode_id}.json / {episode_id}.md
 
+    A bytes result (Transcriber.transcribe with as_json_bytes=True) is already
+    in the on-disk JSON format and is written without re-encoding.
+
     Returns:
         Tuple of (json_path, md_path).
     """
+    raw_json = result if isinstance(result, bytes) else None
+    if raw_json is not None:
+        result = orjson.loads(raw_json)
     if isinstance(result, dict):
         result = dict_to_result(result)
 
-    output_dir.mkdir(parents=True, exist_ok=True)
+    if _ensure_dir:
+        output_dir.mkdir(parents=True, exist_ok=True)
 
     json_path = output_dir / f"{result.episode_id}.json"
     md_path = output_dir / f"{result.episode_id}.md"
 
-    result.to_json(json_path)
-    result.to_markdown(md_path)
+    if raw_json is not None:
+        tmp = json_path.with_suffix(".json.tmp")
+        tmp.write_bytes(raw_json)
+        os.replace(tmp, json_path)
+    else:
+        result.to_json(json_path)
+    result.write_markdown(md_path)
 
-    logger.info("Saved transcript: %s (.json + .md)", result.episode_id)
+    logger.info(
+        "Saved transcript: %s (.json + .md, %d words)", result.episode_id, result.word_count,
+    )
     return json_path, md_path
 
 
 def save_batch(
     results: list[dict],
     output_dir: Path = DEFAULT_OUTPUT_DIR,
+    max_workers: int = 8,
 ) -> list[tuple[Path, Path]]:
-    """Save multiple transcription results at once."""
-    paths = []
-    for raw in results:
-        paths.append(save_transcript(raw, output_dir))
+    """Save multiple transcription results at once.
+
+    Each result writes its own {episode_id}.json/.md, so the writes run on a
+    thread pool. Paths are returned in input order.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    def save_one(raw: dict) -> tuple[Path, Path]:
+        return save_transcript(raw, output_dir, _ensure_dir=False)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        paths = list(pool.map(save_one, results))
     logger.info("Saved %d transcripts to %s", len(paths), output_dir)
     return paths
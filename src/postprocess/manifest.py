@@ -0,0 +1,57 @@
+"""Cached index of transcript IDs in an output directory.
+
+Several scripts need the set of episode IDs that already have transcripts.
+Rather than re-scanning the directory each time, the IDs are cached next to
+it and reused until the directory's mtime changes (any file added, removed
+or renamed bumps it). json_files lists a directory's JSON files for the
+aggregation scripts.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import orjson
+
+
+def json_files(directory: Path) -> list[str]:
+    """Sorted paths of the *.json files in a directory."""
+    return sorted(
+        e.path for e in os.scandir(directory) if e.name.endswith(".json") and e.is_file()
+    )
+
+
+def _index_path(directory: Path) -> Path:
+    # Kept outside the directory itself so writing it doesn't bump the mtime
+    return directory.parent / f".{directory.name}_index.json"
+
+
+def transcript_ids(directory: Path, index_path: Path | None = None) -> set[str]:
+    """Return the stems of all *.json files in directory.
+
+    Missing directories yield an empty set.
+    """
+    try:
+        mtime = directory.stat().st_mtime_ns
+    except FileNotFoundError:
+        return set()
+
+    index_path = index_path or _index_path(directory)
+    try:
+        cached = orjson.loads(index_path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        cached = None
+    if cached and cached.get("mtime_ns") == mtime:
+        return set(cached["ids"])
+
+    with os.scandir(directory) as it:
+        ids = {e.name[:-5] for e in it if e.name.endswith(".json")}
+
+    try:
+        tmp = index_path.with_suffix(".tmp")
+        tmp.write_bytes(orjson.dumps({"mtime_ns": mtime, "ids": sorted(ids)}))
+        os.replace(tmp, index_path)
+    except OSError:
+        pass  # read-only checkout: fall back to scanning every time
+    return ids
@@ -11,13 +11,18 @@ Uses Kimi K2.5 via api-proxy for best Chinese accuracy.
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import os
 import re
+from collections.abc import AsyncIterator
 from pathlib import Path
 
 import httpx
+import orjson
+
+from src.llm_client import LLMClient, budget_tokens
+from src.models import count_words
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +30,9 @@ DEFAULT_API_BASE = os.environ.get("API_BASE", "http://localhost:8180/v1")
 DEFAULT_API_KEY = os.environ.get("API_KEY", "sk-podcast-proofread")
 DEFAULT_MODEL = os.environ.get("PROOFREAD_MODEL", "kimi-k2.5")
 
+# One change line: "原文" → "修正" (原因)
+_CHANGE_LINE_RE = re.compile(r'"(.+?)"\s*→\s*"(.+?)"\s*\((.+?)\)')
+
 SYSTEM_PROMPT = """你是一个中文播客转录校对专家。这是一档哲学播客《独树不成林》的 Whisper 语音识别文本。
 
 你的任务是修正 ASR（语音识别）错误，只修正以下类型：
@@ -68,9 +76,13 @@ def proofread_text(
     model: str = DEFAULT_MODEL,
     timeout: float = 600.0,
     retries: int = 2,
+    use_cache: bool = True,
 ) -> dict:
     """Proofread a transcript text using LLM.
 
+    With use_cache, a reply for a byte-identical request is reused from
+    the src.llm_cache disk cache instead of calling the LLM again.
+
     Returns:
         {
             "corrected": str,       # Full corrected text
@@ -78,37 +90,64 @@ def proofread_text(
             "has_changes": bool,
             "model": str,
         }
+
+    Raises:
+        ValueError: The reply was cut off before its change list.
     """
+    llm = LLMClient(api_base, api_key, timeout=timeout, retries=retries, use_cache=use_cache)
+    # Streamed: the corrected transcript can be ~16k tokens
+    payload = _build_payload(text, title, model)
+    content = llm.complete(payload, stream=True)
+    return _parse_or_forget(llm, payload, content)
+
+
+async def proofread_text_async(
+    text: str,
+    title: str = "",
+    api_base: str = DEFAULT_API_BASE,
+    api_key: str = DEFAULT_API_KEY,
+    model: str = DEFAULT_MODEL,
+    timeout: float = 600.0,
+    retries: int = 2,
+    use_cache: bool = True,
+    client: httpx.AsyncClient | None = None,
+) -> dict:
+    """Async variant of proofread_text.
+
+    Pass a shared ``client`` to reuse connections across many concurrent calls.
+    """
+    llm = LLMClient(api_base, api_key, timeout=timeout, retries=retries, use_cache=use_cache)
+    payload = _build_payload(text, title, model)
+    content = await llm.complete_async(payload, stream=True, client=client)
+    return _parse_or_forget(llm, payload, content)
+
+
+def _build_payload(text: str, title: str, model: str) -> dict:
+    """Chat-completions request body for one transcript."""
     user_msg = f"标题：{title}\n\n以下是需要校对的转录文本：\n\n{text}"
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_msg},
+        ],
+        "temperature": 0.1,
+        # Output is the corrected text (same length) plus the change list
+        "max_tokens": budget_tokens(text, 16384, per_char=1.2, overhead=500),
+    }
+
 
-    last_err = None
-    for attempt in range(1 + retries):
-        try:
-            with httpx.Client(timeout=timeout) as client:
-                resp = client.post(
-                    f"{api_base}/chat/completions",
-                    headers={"Authorization": f"Bearer {api_key}"},
-                    json={
-                        "model": model,
-                        "messages": [
-                            {"role": "system", "content": SYSTEM_PROMPT},
-                            {"role": "user", "content": user_msg},
-                        ],
-                        "temperature": 0.1,
-                        "max_tokens": 16384,
-                    },
-                )
-                resp.raise_for_status()
-                content = resp.json()["choices"][0]["message"]["content"]
-            return _parse_response(content, model)
-        except (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.RemoteProtocolError) as e:
-            last_err = e
-            if attempt < retries:
-                import time
-                wait = 10 * (attempt + 1)
-                logger.warning("Attempt %d/%d timed out, retrying in %ds...", attempt + 1, 1 + retries, wait)
-                time.sleep(wait)
-    raise last_err  # type: ignore[misc]
+def _parse_or_forget(llm: LLMClient, payload: dict, content: str) -> dict:
+    """Parse a reply; a truncated one is evicted from the cache and raises ValueError.
+
+    A complete reply always ends with the ---CHANGES--- section; without it
+    the output was cut off, most likely at max_tokens. Raising keeps the
+    partial text from being saved over the full transcript.
+    """
+    if "---CHANGES---" not in content or not content.split("---CHANGES---", 1)[0].strip():
+        llm.forget(payload)
+        raise ValueError(f"truncated proofread reply ({len(content)} chars)")
+    return _parse_response(content, payload["model"])
 
 
 def _parse_response(content: str, model: str) -> dict:
@@ -125,7 +164,7 @@ def _parse_response(content: str, model: str) -> dict:
     if changes_text and "无修改" not in changes_text:
         for line in changes_text.split("\n"):
             line = line.strip().lstrip("- ")
-            match = re.match(r'"(.+?)"\s*→\s*"(.+?)"\s*\((.+?)\)', line)
+            match = _CHANGE_LINE_RE.match(line)
             if match:
                 changes.append({
                     "original": match.group(1),
@@ -144,15 +183,15 @@ def _parse_response(content: str, model: str) -> dict:
 def proofread_transcript(
     transcript_path: Path,
     output_dir: Path | None = None,
+    pretty_json: bool = False,
     **kwargs,
 ) -> dict:
     """Proofread a transcript JSON file.
 
-    Reads the transcript, sends text to LLM, saves corrected version.
-    Returns the proofread result dict.
+    Reads the transcript, sends text to LLM, saves corrected version
+    (compact JSON unless pretty_json). Returns the proofread result dict.
     """
-    with open(transcript_path) as f:
-        data = json.load(f)
+    data = orjson.loads(transcript_path.read_bytes())
 
     text = data.get("transcription", "")
     title = data.get("title", "")
@@ -163,8 +202,85 @@ def proofread_transcript(
 
     logger.info("Proofreading: %s — %s (%d chars)", data.get("episode_id", ""), title, len(text))
     result = proofread_text(text, title=title, **kwargs)
+    _save_result(data, result, transcript_path, output_dir, pretty_json)
+    return result
+
+
+async def proofread_transcript_async(
+    transcript_path: Path,
+    output_dir: Path | None = None,
+    pretty_json: bool = False,
+    **kwargs,
+) -> dict:
+    """Async variant of proofread_transcript; kwargs go to proofread_text_async."""
+    data = orjson.loads(transcript_path.read_bytes())
+
+    text = data.get("transcription", "")
+    title = data.get("title", "")
 
-    # Save proofread result
+    if not text:
+        logger.warning("Empty transcript: %s", transcript_path)
+        return {"has_changes": False, "changes": []}
+
+    logger.info("Proofreading: %s — %s (%d chars)", data.get("episode_id", ""), title, len(text))
+    result = await proofread_text_async(text, title=title, **kwargs)
+    _save_result(data, result, transcript_path, output_dir, pretty_json)
+    return result
+
+
+async def proofread_transcripts_async(
+    transcript_paths: list[Path],
+    concurrency: int = 16,
+    timeout: float = 600.0,
+    **kwargs,
+) -> AsyncIterator[tuple[Path, dict | Exception]]:
+    """Proofread many transcripts concurrently, yielding (path, result) as each finishes.
+
+    At most ``concurrency`` requests are in flight, all sharing one pooled
+    client. A failed transcript yields its exception instead of aborting the
+    batch; logging it is left to the caller. kwargs go to
+    proofread_transcript_async.
+    """
+    sem = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+
+        async def one(path: Path) -> tuple[Path, dict | Exception]:
+            async with sem:
+                try:
+                    return path, await proofread_transcript_async(
+                        path, client=client, timeout=timeout, **kwargs
+                    )
+                except Exception as e:
+                    return path, e
+
+        for next_done in asyncio.as_completed([one(p) for p in transcript_paths]):
+            yield await next_done
+
+
+def proofread_transcripts(
+    transcript_paths: list[Path], concurrency: int = 16, **kwargs
+) -> list[tuple[Path, dict | Exception]]:
+    """Blocking wrapper around proofread_transcripts_async; results in completion order."""
+
+    async def collect() -> list[tuple[Path, dict | Exception]]:
+        return [
+            r async for r in proofread_transcripts_async(transcript_paths, concurrency, **kwargs)
+        ]
+
+    return asyncio.run(collect())
+
+
+def _save_result(
+    data: dict,
+    result: dict,
+    transcript_path: Path,
+    output_dir: Path | None,
+    pretty_json: bool = False,
+) -> None:
+    """Save the corrected transcript JSON and markdown."""
+    text = data.get("transcription", "")
+    title = data.get("title", "")
     out_dir = output_dir or transcript_path.parent
     out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -183,25 +299,25 @@ def proofread_transcript(
     }
 
     out_path = out_dir / f"{episode_id}.json"
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(corrected_data, f, ensure_ascii=False, indent=2)
+    option = orjson.OPT_INDENT_2 if pretty_json else None
+    out_path.write_bytes(orjson.dumps(corrected_data, option=option))
 
     # Save corrected markdown
     md_path = out_dir / f"{episode_id}.md"
+    corrected = result["corrected"]
     with open(md_path, "w", encoding="utf-8") as f:
         f.write(f"# {title}\n\n")
         f.write(f"- Episode ID: {episode_id}\n")
         f.write(f"- Date: {data.get('date', '')}\n")
         f.write(f"- Duration: {data.get('duration', 0):.0f}s\n")
-        f.write(f"- Words: {len(result['corrected'].replace(' ', ''))}\n")
+        f.write(f"- Words: {count_words(corrected)}\n")
         f.write(f"- Proofread: {result['model']}\n")
         if result["changes"]:
             f.write(f"- Changes: {len(result['changes'])}\n")
-        f.write(f"\n---\n\n{result['corrected']}\n")
+        f.write(f"\n---\n\n{corrected}\n")
 
     logger.info(
         "  Done: %d changes, saved to %s",
         len(result["changes"]),
         out_path,
     )
-    return result
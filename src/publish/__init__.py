@@ -1 +1,3 @@
 # HuggingFace Dataset sync
+from src.publish.hub import cached_repo_files as cached_repo_files
+from src.publish.hub import configure_hf_session as configure_hf_session
@@ -0,0 +1,100 @@
+"""Cached HuggingFace repo listings and a shared pooled HTTP session.
+
+Listing a dataset repo paginates through every file, which gets slow as
+the repos grow. The listing only changes when the repo gets a new commit,
+so it is cached on disk keyed by the head commit SHA and revalidated with
+a single repo_info call. Within a process, listings are also memoized so
+scripts that check the same repo twice only parse the cache once.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(".cache/hf")
+
+# (repo_type, repo_id, sha) -> files, so repeat lookups in one run skip the disk
+_memo: dict[tuple[str, str, str], list[str]] = {}
+
+
+def configure_hf_session(pool_size: int = 64) -> None:
+    """Route huggingface_hub through one pooled requests.Session with retries.
+
+    Keeps TLS connections alive across every HfApi call in the process and
+    retries transient 429/5xx responses with backoff. No-op on
+    huggingface_hub versions without configure_http_backend (1.x manages
+    its own httpx client).
+    """
+    try:
+        from huggingface_hub import configure_http_backend
+    except ImportError:
+        return
+
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=5, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_size, max_retries=retry)
+
+    def factory() -> requests.Session:
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    configure_http_backend(backend_factory=factory)
+
+
+def _cache_path(cache_dir: Path, repo_id: str, repo_type: str) -> Path:
+    return cache_dir / f"{repo_type}--{repo_id.replace('/', '--')}.json"
+
+
+def cached_repo_files(
+    api,
+    repo_id: str,
+    repo_type: str = "dataset",
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+) -> list[str]:
+    """Return every file path in a Hub repo, re-listing only on new commits.
+
+    Args:
+        api: An authenticated huggingface_hub.HfApi.
+        repo_id: Repo to list, e.g. "Adam429/podcast-audio".
+        repo_type: "dataset", "model" or "space".
+        cache_dir: Where listings are cached, one JSON file per repo.
+    """
+    sha = api.repo_info(repo_id, repo_type=repo_type).sha
+    key = (repo_type, repo_id, sha)
+    if key in _memo:
+        return _memo[key]
+
+    path = _cache_path(cache_dir, repo_id, repo_type)
+
+    try:
+        cached = orjson.loads(path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        cached = None
+    if cached and cached.get("sha") == sha:
+        logger.debug("Repo listing cache hit: %s@%s", repo_id, sha)
+        _memo[key] = cached["files"]
+        return _memo[key]
+
+    files = api.list_repo_files(repo_id, repo_type=repo_type, revision=sha)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_bytes(orjson.dumps({"sha": sha, "files": files}))
+    os.replace(tmp, path)
+    logger.debug("Repo listing refreshed: %s@%s (%d files)", repo_id, sha, len(files))
+    _memo[key] = files
+    return files
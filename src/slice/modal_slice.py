@@ -5,17 +5,196 @@ uploads segments back to HuggingFace.
 """
 from __future__ import annotations
 
+from functools import lru_cache
+
 import modal
 
 app = modal.App("podcast-slice")
 
 image = (
     modal.Image.debian_slim(python_version="3.11")
-    .apt_install("ffmpeg")
-    .pip_install("webrtcvad", "pydub", "numpy", "scipy", "huggingface_hub", "httpx")
+    .pip_install(
+        "webrtcvad", "av", "numpy", "scipy", "numba", "huggingface_hub", "hf_transfer", "httpx",
+        "orjson",
+    )
+    # Multi-connection Rust transfers for hub LFS uploads/downloads
+    .env({"HF_HUB_ENABLE_HF_TRANSFER": "1"})
 )
 
 
+@lru_cache(maxsize=1)
+def _frame_features_kernel():
+    """Compile (once per container) the Numba kernel for per-frame energy and ZCR."""
+    import numba
+    import numpy as np
+
+    @numba.njit(cache=True, parallel=True)
+    def kernel(frames):
+        n_frames, n = frames.shape
+        energy_db = np.empty(n_frames, np.float64)
+        zcr = np.empty(n_frames, np.float64)
+        for i in numba.prange(n_frames):
+            energy = np.int64(0)
+            crossings = 0
+            prev_neg = frames[i, 0] < 0
+            for j in range(n):
+                s = np.int64(frames[i, j])
+                energy += s * s
+                neg = s < 0
+                if neg != prev_neg:
+                    crossings += 1
+                prev_neg = neg
+            energy_db[i] = 10.0 * np.log10(energy / n + 1.0)
+            zcr[i] = crossings / n
+        return energy_db, zcr
+
+    return kernel
+
+
+def _energy_vad(frames, aggressiveness: int):
+    """Speech mask for an (n_frames, frame_samples) int16 array.
+
+    A frame is speech when its energy clears the recording's noise floor
+    (10th-percentile frame energy) by a margin that grows with
+    aggressiveness, and its zero-crossing rate is not noise-like.
+    """
+    import numpy as np
+
+    energy_db, zcr = _frame_features_kernel()(frames)
+    noise_floor = np.percentile(energy_db, 10)
+    return (energy_db > noise_floor + 6.0 + 3.0 * aggressiveness) & (zcr < 0.35)
+
+
+def _vad_candidates(frames, pct: float = 20.0, factor: float = 1.5, abs_floor: float = 10.0):
+    """Mask of frames loud enough to be worth a webrtcvad call.
+
+    A frame is dropped when its RMS is at or below abs_floor (about -70
+    dBFS, effectively digital silence) or below factor x the pct-th
+    percentile frame RMS. The relative gate is capped at half the median
+    RMS, so a recording with no quiet stretches (e.g. continuous speech)
+    keeps all of its frames instead of always losing the bottom pct%.
+    """
+    import numpy as np
+
+    rms = np.sqrt(np.square(frames, dtype=np.float32).mean(axis=1))
+    if len(rms) == 0:
+        return np.zeros(0, dtype=bool)
+    relative = min(factor * np.percentile(rms, pct), 0.5 * np.median(rms))
+    return rms > max(abs_floor, relative)
+
+
+def _speech_segments(is_speech, min_silence_frames: int):
+    """(start, end) frame ranges of speech, split only at silences of min_silence_frames+.
+
+    Run-length encodes the mask, then bridges every gap shorter than
+    min_silence_frames. Ends are exclusive.
+    """
+    import numpy as np
+
+    mask = np.asarray(is_speech, dtype=np.int8)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask, [0]))))
+    starts, ends = edges[0::2], edges[1::2]
+    if len(starts) == 0:
+        return starts, ends
+
+    # A run starts a new segment unless the silence before it is too short to split on
+    new_segment = np.concatenate(([True], starts[1:] - ends[:-1] >= min_silence_frames))
+    first = np.flatnonzero(new_segment)
+    last = np.concatenate((first[1:] - 1, [len(starts) - 1]))
+    return starts[first], ends[last]
+
+
+def _segment_rms_zcr(pcm, starts, ends):
+    """RMS and zero-crossing rate of every pcm[start:end] in one pass.
+
+    Squares and sign changes are computed once for the whole recording
+    (float32 / int8, so a 2 h episode needs ~0.6 GB) and summed per segment
+    with np.add.reduceat instead of slicing and reducing segment by segment.
+    ZCR matches sum(|diff(sign(x))|) / (2 * len(x)) on each segment.
+    """
+    import numpy as np
+
+    n = len(pcm)
+    # One trailing zero so segment ends equal to len(pcm) are valid reduceat indices
+    sq = np.zeros(n + 1, np.float32)
+    np.multiply(pcm, pcm, out=sq[:n], dtype=np.float32)
+    sign_steps = np.zeros(n, np.int8)
+    np.abs(np.diff(np.sign(pcm).astype(np.int8)), out=sign_steps[:n - 1])
+
+    lengths = ends - starts
+    bounds = np.column_stack([starts, ends]).ravel()
+    sum_sq = np.add.reduceat(sq, bounds, dtype=np.float64)[::2]
+    # Sign steps inside pcm[start:end] are sign_steps[start:end - 1]
+    steps = np.add.reduceat(
+        sign_steps, np.column_stack([starts, ends - 1]).ravel(), dtype=np.int64
+    )[::2]
+    return np.sqrt(sum_sq / lengths), steps / (2 * lengths)
+
+
+def _spectral_flatness(pcm, starts, ends, max_rows: int = 64):
+    """Spectral flatness of every pcm[start:end], with batched FFTs.
+
+    Segments of equal length (they are whole VAD frames, so lengths repeat)
+    are stacked and transformed together by scipy.fft on all cores, at most
+    max_rows at a time. Grouping by length instead of zero-padding keeps
+    each spectrum that of its own segment; rows are float32, so values match
+    a per-segment float64 rfft only to single-precision rounding.
+    """
+    import numpy as np
+    import scipy.fft
+
+    flatness = np.zeros(len(starts))
+    lengths = ends - starts
+    for length in np.unique(lengths):
+        rows = np.flatnonzero(lengths == length)
+        for chunk in np.array_split(rows, -(-len(rows) // max_rows)):
+            batch = np.stack([pcm[starts[i]:starts[i] + length] for i in chunk]).astype(np.float32)
+            mag = np.abs(scipy.fft.rfft(batch, axis=-1, workers=-1))
+            nonzero = mag > 0
+            count = nonzero.sum(axis=1)
+            log_sum = np.where(nonzero, np.log(mag + 1e-10), 0.0).sum(axis=1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                geo_mean = np.exp(log_sum / count)
+                arith_mean = mag.sum(axis=1) / count
+                flat = geo_mean / np.maximum(arith_mean, 1e-10)
+            flatness[chunk] = np.where(count > 0, flat, 0.0)
+    return flatness
+
+
+def _noise_floor(samples, q: float = 0.05) -> float:
+    """q-quantile of |samples|, as np.percentile(np.abs(samples), 100 * q) computes it.
+
+    Uses np.partition to select the two neighbouring order statistics in
+    O(n) instead of sorting the whole segment.
+    """
+    import numpy as np
+
+    mags = np.abs(samples)
+    pos = q * (len(mags) - 1)
+    lo = int(pos)
+    hi = min(lo + 1, len(mags) - 1)
+    part = np.partition(mags, (lo, hi))
+    return float(part[lo]) + (pos - lo) * (float(part[hi]) - float(part[lo]))
+
+
+def _decode_pcm(path: str, sample_rate: int = 16000):
+    """Decode an audio file to mono int16 PCM at sample_rate, in-process with PyAV."""
+    import av
+    import numpy as np
+
+    chunks = []
+    with av.open(path) as container:
+        stream = container.streams.audio[0]
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+        for frame in container.decode(stream):
+            for out in resampler.resample(frame):
+                chunks.append(out.to_ndarray().reshape(-1))
+        # Flush samples still buffered in the resampler
+        for out in resampler.resample(None):
+            chunks.append(out.to_ndarray().reshape(-1))
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int16)
+
+
 @app.function(image=image, timeout=600, cpu=2.0, memory=4096)
 def slice_episode(
     episode_id: str,
@@ -25,22 +204,22 @@ def slice_episode(
     min_duration: float = 3.0,
     max_duration: float = 15.0,
     aggressiveness: int = 2,
+    vad: str = "webrtc",
 ) -> dict:
     """Slice a single episode's audio into segments using VAD.
 
+    vad selects the speech detector: "webrtc" (webrtcvad, per frame) or
+    "energy" (Numba energy + zero-crossing kernel over all frames at once).
+
     Returns dict with episode_id, segment count, quality stats.
     """
     import io
-    import json
     import struct
-    import tempfile
     import wave
-    from pathlib import Path
 
     import numpy as np
-    import webrtcvad
-    from huggingface_hub import HfApi, hf_hub_download
-    from pydub import AudioSegment
+    import orjson
+    from huggingface_hub import CommitOperationAdd, HfApi, hf_hub_download
     from scipy import signal as scipy_signal
 
     api = HfApi(token=hf_token)
@@ -61,146 +240,129 @@ def slice_episode(
     if audio_path is None:
         return {"episode_id": episode_id, "error": "audio not found on HF", "segments": 0}
 
-    # Convert to 16kHz mono WAV for VAD
-    audio = AudioSegment.from_file(audio_path)
-    audio = audio.set_frame_rate(16000).set_channels(1).set_sample_width(2)
-
     # VAD segmentation
-    vad = webrtcvad.Vad(aggressiveness)
     sample_rate = 16000
     frame_duration_ms = 30
-    frame_size = int(sample_rate * frame_duration_ms / 1000) * 2  # bytes
+    frame_samples = int(sample_rate * frame_duration_ms / 1000)
+    frame_size = frame_samples * 2  # bytes
 
-    raw = audio.raw_data
-    frames = [raw[i:i + frame_size] for i in range(0, len(raw), frame_size)]
-    frames = [f for f in frames if len(f) == frame_size]
+    # Decode straight to 16kHz mono int16 for VAD
+    pcm = _decode_pcm(audio_path, sample_rate)
 
-    # Detect speech segments
-    is_speech = []
-    for frame in frames:
-        try:
-            is_speech.append(vad.is_speech(frame, sample_rate))
-        except Exception:
-            is_speech.append(False)
+    # Detect speech segments (a trailing partial frame is dropped)
+    n_frames = len(pcm) // frame_samples
+    frames = pcm[:n_frames * frame_samples].reshape(n_frames, frame_samples)
+    if vad == "energy":
+        is_speech = _energy_vad(frames, aggressiveness)
+    else:
+        import webrtcvad
 
-    # Merge adjacent speech frames into segments
-    segments = []
-    in_segment = False
-    start = 0
+        detector = webrtcvad.Vad(aggressiveness)
+        # Frames at the episode's noise floor are silence; skip the VAD call for them
+        mv = memoryview(pcm).cast("B")
+
+        is_speech = np.zeros(n_frames, dtype=bool)
+        for i in np.flatnonzero(_vad_candidates(frames)).tolist():
+            try:
+                is_speech[i] = detector.is_speech(
+                    mv[i * frame_size:(i + 1) * frame_size], sample_rate
+                )
+            except Exception:
+                pass
+
+    # Merge adjacent speech frames into segments, keeping those of a usable length
     min_silence_frames = int(300 / frame_duration_ms)  # 300ms silence to split
+    seg_starts, seg_ends = _speech_segments(is_speech, min_silence_frames)
+    durations = (seg_ends - seg_starts) * frame_duration_ms / 1000
+    keep = (durations >= min_duration) & (durations <= max_duration)
+    segments = list(zip(seg_starts[keep].tolist(), seg_ends[keep].tolist()))
 
-    silence_count = 0
-    for i, speech in enumerate(is_speech):
-        if speech:
-            if not in_segment:
-                start = i
-                in_segment = True
-            silence_count = 0
-        else:
-            if in_segment:
-                silence_count += 1
-                if silence_count >= min_silence_frames:
-                    end = i - silence_count
-                    duration = (end - start) * frame_duration_ms / 1000
-                    if min_duration <= duration <= max_duration:
-                        segments.append((start, end))
-                    in_segment = False
-                    silence_count = 0
-
-    if in_segment:
-        end = len(is_speech)
-        duration = (end - start) * frame_duration_ms / 1000
-        if min_duration <= duration <= max_duration:
-            segments.append((start, end))
+    # RMS and zero-crossing rate for all segments in one pass
+    seg_bounds = np.array(segments, dtype=np.int64).reshape(-1, 2) * frame_samples
+    if segments:
+        seg_rms, seg_zcr = _segment_rms_zcr(pcm, seg_bounds[:, 0], seg_bounds[:, 1])
+        seg_flatness = _spectral_flatness(pcm, seg_bounds[:, 0], seg_bounds[:, 1])
 
     # Extract segments and analyze quality
     results = []
-    with tempfile.TemporaryDirectory() as tmpdir:
-        for idx, (start_frame, end_frame) in enumerate(segments):
-            start_ms = start_frame * frame_duration_ms
-            end_ms = end_frame * frame_duration_ms
-            segment_audio = audio[start_ms:end_ms]
-
-            # Quality analysis
-            samples = np.array(segment_audio.get_array_of_samples(), dtype=np.float32)
-            if len(samples) == 0:
-                continue
-
-            # SNR estimation
-            rms = np.sqrt(np.mean(samples ** 2))
-            noise_floor = np.percentile(np.abs(samples), 5)
-            snr = 20 * np.log10(rms / max(noise_floor, 1e-10))
-
-            # Spectral flatness
-            freqs = np.abs(np.fft.rfft(samples))
-            freqs = freqs[freqs > 0]
-            if len(freqs) > 0:
-                geo_mean = np.exp(np.mean(np.log(freqs + 1e-10)))
-                arith_mean = np.mean(freqs)
-                spectral_flatness = geo_mean / max(arith_mean, 1e-10)
-            else:
-                spectral_flatness = 0
-
-            # Zero crossing rate
-            zcr = np.sum(np.abs(np.diff(np.sign(samples)))) / (2 * len(samples))
-
-            duration_s = (end_ms - start_ms) / 1000
-            quality_score = snr * 0.4 + (1 - spectral_flatness) * 30 + (1 - min(zcr * 10, 1)) * 30
-
-            seg_info = {
-                "episode_id": episode_id,
-                "segment_idx": idx,
-                "start_ms": start_ms,
-                "end_ms": end_ms,
-                "duration_s": round(duration_s, 2),
-                "snr": round(float(snr), 2),
-                "spectral_flatness": round(float(spectral_flatness), 4),
-                "zcr": round(float(zcr), 4),
-                "quality_score": round(float(quality_score), 2),
-            }
-            results.append(seg_info)
-
-            # Export segment as WAV
-            seg_path = Path(tmpdir) / f"{episode_id}_{idx:04d}.wav"
-            segment_audio.export(str(seg_path), format="wav",
-                                 parameters=["-ar", "24000", "-ac", "1"])
-
-        # Upload to HF (always, even if 0 segments — so dedup marks it done)
-        upload_dir = Path(tmpdir) / "upload" / episode_id
-        upload_dir.mkdir(parents=True, exist_ok=True)
-
-        # Always save analysis JSON (empty list if no segments)
-        with open(upload_dir / "analysis.json", "w") as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
-
-        # Copy top 10 segments by quality
-        if results:
-            top_segments = sorted(results, key=lambda x: x["quality_score"], reverse=True)[:10]
-            for seg in top_segments:
-                idx = seg["segment_idx"]
-                seg_file = Path(tmpdir) / f"{episode_id}_{idx:04d}.wav"
-                if seg_file.exists():
-                    import shutil
-                    shutil.copy2(str(seg_file), str(upload_dir / f"{episode_id}_{idx:04d}.wav"))
-
-        # Single upload_folder call (one HF commit) — retry on 412 conflict
-        import time as _time
-        for _attempt in range(4):
-            try:
-                api.upload_folder(
-                    folder_path=str(upload_dir),
-                    path_in_repo=f"slices/{episode_id}",
-                    repo_id=output_repo,
-                    repo_type="dataset",
-                    commit_message=f"Slices: {episode_id} ({len(results)} segments)",
-                )
-                break
-            except Exception as _upload_err:
-                if "412" in str(_upload_err) or "Precondition" in str(_upload_err):
-                    if _attempt < 3:
-                        _time.sleep(5 * (_attempt + 1))
-                        continue
-                raise
+    for idx, (start_frame, end_frame) in enumerate(segments):
+        start_ms = start_frame * frame_duration_ms
+        end_ms = end_frame * frame_duration_ms
+
+        # Quality analysis
+        samples = pcm[seg_bounds[idx, 0]:seg_bounds[idx, 1]].astype(np.float32)
+        if len(samples) == 0:
+            continue
+
+        # SNR estimation
+        rms = seg_rms[idx]
+        noise_floor = _noise_floor(samples)
+        snr = 20 * np.log10(rms / max(noise_floor, 1e-10))
+
+        spectral_flatness = seg_flatness[idx]
+        zcr = seg_zcr[idx]
+
+        duration_s = (end_ms - start_ms) / 1000
+        quality_score = snr * 0.4 + (1 - spectral_flatness) * 30 + (1 - min(zcr * 10, 1)) * 30
+
+        seg_info = {
+            "episode_id": episode_id,
+            "segment_idx": idx,
+            "start_ms": start_ms,
+            "end_ms": end_ms,
+            "duration_s": round(duration_s, 2),
+            "snr": round(float(snr), 2),
+            "spectral_flatness": round(float(spectral_flatness), 4),
+            "zcr": round(float(zcr), 4),
+            "quality_score": round(float(quality_score), 2),
+        }
+        results.append(seg_info)
+
+    # Upload to HF (always, even if 0 segments — so dedup marks it done).
+    # Files are built in memory and go up as one commit.
+    prefix = f"slices/{episode_id}"
+    operations = [
+        CommitOperationAdd(
+            path_in_repo=f"{prefix}/analysis.json",
+            path_or_fileobj=orjson.dumps(results, option=orjson.OPT_INDENT_2),
+        )
+    ]
+
+    # Top 10 segments by quality as 24 kHz mono WAV, straight from the PCM
+    if results:
+        top_segments = sorted(results, key=lambda x: x["quality_score"], reverse=True)[:10]
+        for seg in top_segments:
+            idx = seg["segment_idx"]
+            seg_pcm = pcm[seg_bounds[idx, 0]:seg_bounds[idx, 1]]
+            resampled = scipy_signal.resample_poly(seg_pcm.astype(np.float32), up=3, down=2)
+            buf = io.BytesIO()
+            with wave.open(buf, "wb") as w:
+                w.setnchannels(1)
+                w.setsampwidth(2)
+                w.setframerate(24000)
+                w.writeframes(np.clip(resampled, -32768, 32767).astype(np.int16).tobytes())
+            operations.append(CommitOperationAdd(
+                path_in_repo=f"{prefix}/{episode_id}_{idx:04d}.wav",
+                path_or_fileobj=buf.getvalue(),
+            ))
+
+    # Single create_commit call (one HF commit) — retry on 412 conflict
+    import time as _time
+    for _attempt in range(4):
+        try:
+            api.create_commit(
+                repo_id=output_repo,
+                repo_type="dataset",
+                operations=operations,
+                commit_message=f"Slices: {episode_id} ({len(results)} segments)",
+            )
+            break
+        except Exception as _upload_err:
+            if "412" in str(_upload_err) or "Precondition" in str(_upload_err):
+                if _attempt < 3:
+                    _time.sleep(5 * (_attempt + 1))
+                    continue
+            raise
 
     return {
         "episode_id": episode_id,
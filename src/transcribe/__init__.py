@@ -1,2 +1,2 @@
+from src.transcribe.modal_whisper import Transcriber as Transcriber
 from src.transcribe.modal_whisper import app as app
-from src.transcribe.modal_whisper import transcribe_episode as transcribe_episode
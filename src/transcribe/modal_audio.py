@@ -12,7 +12,6 @@ from __future__ import annotations
 
 import logging
 import os
-import subprocess
 import tempfile
 from pathlib import Path
 
@@ -24,8 +23,9 @@ app = modal.App("podcast-audio-upload")
 
 audio_image = (
     modal.Image.debian_slim(python_version="3.11")
-    .apt_install("curl")
-    .pip_install("huggingface_hub>=0.20")
+    .pip_install("huggingface_hub>=0.20", "hf_transfer", "httpx")
+    # Multi-connection Rust transfers for the LFS audio upload
+    .env({"HF_HUB_ENABLE_HF_TRANSFER": "1"})
 )
 
 
@@ -45,6 +45,7 @@ def download_and_upload_audio(
 
     Returns dict with episode_id, filename, size_mb, hf_path.
     """
+    import httpx
     from huggingface_hub import HfApi
 
     # Determine extension
@@ -60,11 +61,11 @@ def download_and_upload_audio(
         out_path = Path(tmpdir) / filename
         logger.info("Downloading: %s", audio_url)
 
-        subprocess.run(
-            ["curl", "-fsSL", "-o", str(out_path), audio_url],
-            check=True,
-            timeout=300,
-        )
+        with httpx.stream("GET", audio_url, follow_redirects=True, timeout=300) as resp:
+            resp.raise_for_status()
+            with open(out_path, "wb") as f:
+                for chunk in resp.iter_bytes(1 << 20):
+                    f.write(chunk)
 
         size_mb = out_path.stat().st_size / 1_000_000
         logger.info("Downloaded %.1f MB: %s", size_mb, filename)
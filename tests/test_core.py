@@ -18,7 +18,7 @@ from src.ingest.filter import (
     is_special,
 )
 from src.models import Episode, TranscriptionResult
-from src.postprocess.formatter import dict_to_result, save_transcript
+from src.postprocess.formatter import dict_to_result, save_batch, save_transcript
 
 # ---------------------------------------------------------------------------
 # Fixtures
@@ -81,6 +81,7 @@ class TestDialogueFilter:
             "嘉宾",
             "特邀",
             "专访",
+            "做客",
         ],
     )
     def test_dialogue_keywords(self, keyword):
@@ -120,6 +121,13 @@ class TestFilterEpisodes:
         ids = [e.episode_id for e in result]
         assert ids == ["ok1", "ok2"]
 
+    def test_dialogue_scan_maps_back_to_titles(self):
+        from src.ingest.filter import _dialogue_hits
+
+        titles = ["对", "话题", "嘉宾对谈", "", "专访", "普通节目"]
+        assert _dialogue_hits(titles) == {2, 4}
+        assert _dialogue_hits([]) == set()
+
     def test_skip_flags(self):
         episodes = [
             _make_episode(episode_id="paid", audio_size=100_000),
@@ -162,6 +170,12 @@ class TestTranscriptionResult:
         assert data["episode_id"] == "ep001"
         assert data["word_count"] == 4
 
+    def test_count_words(self):
+        from src.models import count_words
+
+        assert count_words("你好 世界") == 4
+        assert count_words("") == 0
+
     def test_to_markdown(self):
         tr = TranscriptionResult(
             episode_id="ep001",
@@ -174,6 +188,19 @@ class TestTranscriptionResult:
         assert "# My Episode" in md
         assert "Hello world" in md
 
+    def test_write_markdown_matches_to_markdown(self, tmp_path):
+        tr = TranscriptionResult(
+            episode_id="ep001",
+            title="标题",
+            date="2025-01-01",
+            duration=600.0,
+            transcription="正文",
+        )
+        text = tr.to_markdown(tmp_path / "a.md")
+        assert (tmp_path / "a.md").read_text(encoding="utf-8") == text
+        tr.write_markdown(tmp_path / "b.md")
+        assert (tmp_path / "b.md").read_text(encoding="utf-8") == text
+
 
 # ---------------------------------------------------------------------------
 # Formatter tests
@@ -206,6 +233,27 @@ class TestFormatter:
             md = md_path.read_text()
             assert "# Test" in md
 
+    def test_save_transcript_from_json_bytes(self):
+        raw = TranscriptionResult(
+            episode_id="ep_bytes",
+            title="Bytes",
+            date="2025-06-01",
+            duration=300.0,
+            transcription="字节",
+        ).to_json().encode("utf-8")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_path, md_path = save_transcript(raw, output_dir=Path(tmpdir))
+            assert json_path.read_bytes() == raw
+            assert "# Bytes" in md_path.read_text()
+
+    def test_save_batch_keeps_order(self, tmp_path):
+        raws = [
+            {"episode_id": f"ep{i}", "title": f"T{i}", "transcription": "文本"} for i in range(5)
+        ]
+        paths = save_batch(raws, output_dir=tmp_path / "out")
+        assert [p.stem for p, _ in paths] == [f"ep{i}" for i in range(5)]
+        assert all(p.exists() and md.exists() for p, md in paths)
+
     def test_dict_to_result(self):
         raw = {
             "episode_id": "x",
@@ -217,3 +265,348 @@ class TestFormatter:
         r = dict_to_result(raw)
         assert r.episode_id == "x"
         assert r.word_count == 3
+
+    def test_dict_to_result_segment_columns(self):
+        rows = [
+            {"start": 0.0, "end": 1.5, "text": "你好"},
+            {"start": 1.5, "end": 3.0, "text": "世界"},
+        ]
+        cols = {"start": [0.0, 1.5], "end": [1.5, 3.0], "text": ["你好", "世界"]}
+        for segments in (rows, cols):
+            r = dict_to_result(
+                {"episode_id": "x", "transcription": "你好世界", "segments": segments}
+            )
+            assert r.segments == rows
+            assert r.segment_columns() == cols
+
+
+# ---------------------------------------------------------------------------
+# Hub listing cache
+# ---------------------------------------------------------------------------
+
+
+class _FakeHubApi:
+    def __init__(self, sha: str, files: list[str]):
+        self.sha = sha
+        self.files = files
+        self.list_calls = 0
+
+    def repo_info(self, repo_id, repo_type=None):
+        return type("Info", (), {"sha": self.sha})()
+
+    def list_repo_files(self, repo_id, repo_type=None, revision=None):
+        self.list_calls += 1
+        return list(self.files)
+
+
+class TestCachedRepoFiles:
+    def test_relists_only_on_new_commit(self):
+        from src.publish.hub import cached_repo_files
+
+        api = _FakeHubApi("abc", ["audio/ep1.m4a"])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_dir = Path(tmpdir)
+            assert cached_repo_files(api, "user/repo", cache_dir=cache_dir) == ["audio/ep1.m4a"]
+            assert cached_repo_files(api, "user/repo", cache_dir=cache_dir) == ["audio/ep1.m4a"]
+            assert api.list_calls == 1
+
+            api.sha = "def"
+            api.files.append("audio/ep2.m4a")
+            files = cached_repo_files(api, "user/repo", cache_dir=cache_dir)
+            assert files == ["audio/ep1.m4a", "audio/ep2.m4a"]
+            assert api.list_calls == 2
+
+
+class TestTranscriptIds:
+    def test_index_tracks_directory_changes(self):
+        from src.postprocess.manifest import transcript_ids
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out = Path(tmpdir) / "transcripts"
+            assert transcript_ids(out) == set()
+
+            out.mkdir()
+            (out / "ep1.json").write_text("{}")
+            (out / "ep1.md").write_text("")
+            assert transcript_ids(out) == {"ep1"}
+            assert (Path(tmpdir) / ".transcripts_index.json").exists()
+
+            (out / "ep2.json").write_text("{}")
+            assert transcript_ids(out) == {"ep1", "ep2"}
+
+    def test_json_files_sorted_paths(self, tmp_path):
+        from src.postprocess.manifest import json_files
+
+        for name in ("b.json", "a.json", "notes.md"):
+            (tmp_path / name).write_text("{}")
+        (tmp_path / "dir.json").mkdir()
+        assert json_files(tmp_path) == [str(tmp_path / "a.json"), str(tmp_path / "b.json")]
+
+
+# ---------------------------------------------------------------------------
+# Feed cache
+# ---------------------------------------------------------------------------
+
+_RSS = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>t</title>
+<item>
+  <title>第一期</title>
+  <guid>https://www.xiaoyuzhoufm.com/episode/64b6980a32fb5cf4c94c775a</guid>
+  <pubDate>Mon, 15 Jan 2024 08:00:00 GMT</pubDate>
+  <enclosure url="https://example.com/ep1.m4a" length="30000000" type="audio/mp4"/>
+</item>
+</channel></rss>"""
+
+
+class TestFeedCache:
+    def test_not_modified_reuses_cached_episodes(self, monkeypatch):
+        import feedparser
+
+        from src.ingest import feed_cache
+
+        real_parse = feedparser.parse
+        calls = []
+
+        def fake_parse(url, etag=None, modified=None):
+            calls.append(etag)
+            if etag == "v1":
+                return feedparser.FeedParserDict(status=304, bozo=0, entries=[])
+            feed = real_parse(_RSS)
+            feed["etag"] = "v1"
+            return feed
+
+        monkeypatch.setattr(feed_cache.feedparser, "parse", fake_parse)
+        monkeypatch.setattr(feed_cache, "_memo", {})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = feed_cache.load_or_refresh("https://example.com/rss", Path(tmpdir))
+            # Same process: served from memory without another request
+            assert feed_cache.load_or_refresh("https://example.com/rss", Path(tmpdir)) == first
+            # Fresh process: conditional GET answered with 304
+            feed_cache._memo.clear()
+            second = feed_cache.load_or_refresh("https://example.com/rss", Path(tmpdir))
+
+        assert calls == [None, "v1"]
+        assert [ep.episode_id for ep in first] == ["64b6980a32fb5cf4c94c775a"]
+        assert second == first
+
+
+# ---------------------------------------------------------------------------
+# LLM client retries
+# ---------------------------------------------------------------------------
+
+
+class TestPostWithRetry:
+    def test_retries_throttled_request_honouring_retry_after(self, monkeypatch):
+        import httpx
+
+        from src import llm_client
+
+        statuses = iter([429, 503, 200])
+
+        def handler(request):
+            status = next(statuses)
+            if status != 200:
+                return httpx.Response(status, headers={"Retry-After": "3"})
+            return httpx.Response(200, json={"ok": True})
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        sleeps = []
+        monkeypatch.setattr(llm_client, "get_client", lambda: client)
+        monkeypatch.setattr(llm_client.time, "sleep", sleeps.append)
+
+        assert llm_client.post_with_retry("http://proxy/v1/x", {}, "key") == {"ok": True}
+        assert sleeps == [3.0, 3.0]
+
+    def test_client_errors_are_not_retried(self, monkeypatch):
+        import httpx
+
+        from src import llm_client
+
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(400)
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(llm_client, "get_client", lambda: client)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            llm_client.post_with_retry("http://proxy/v1/x", {}, "key")
+        assert len(calls) == 1
+
+    def test_stream_joins_content_deltas(self, monkeypatch):
+        import httpx
+
+        from src import llm_client
+
+        events = [
+            'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            'data: {"choices": [{"delta": {"content": "校对"}}]}',
+            ": keep-alive",
+            'data: {"choices": [{"delta": {"content": "文本"}}]}',
+            "data: [DONE]",
+        ]
+
+        def handler(request):
+            assert json.loads(request.content)["stream"] is True
+            return httpx.Response(200, text="\n\n".join(events))
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(llm_client, "get_client", lambda: client)
+
+        assert llm_client.stream_with_retry("http://proxy/v1/x", {}, "key") == "校对文本"
+
+
+class TestLlmCache:
+    def test_key_ignores_dict_order(self):
+        from src.llm_cache import cache_key
+
+        assert cache_key({"a": 1, "b": [1, 2]}) == cache_key({"b": [1, 2], "a": 1})
+        assert cache_key({"a": 1}) != cache_key({"a": 2})
+
+    def test_put_then_get(self, monkeypatch, tmp_path):
+        from src import llm_cache
+
+        monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path)
+        key = llm_cache.cache_key({"model": "m", "messages": []})
+        assert llm_cache.cache_get(key) is None
+        llm_cache.cache_put(key, "回复")
+        assert llm_cache.cache_get(key) == "回复"
+
+
+class TestAnalyzeParseResponse:
+    def _parse(self, content):
+        from src.analyze import _parse_response
+
+        return _parse_response(content, "m", "ep1", "标题")
+
+    def test_fenced_json(self):
+        data = self._parse('```json\n{"style": {"tone": "平和"}, "entities": []}\n```')
+        assert data["style"] == {"tone": "平和"}
+        assert "parse_error" not in data
+        assert data["episode_id"] == "ep1"
+
+    def test_prose_around_object(self):
+        data = self._parse('好的，结果如下：{"style": {}, "entities": [{"name": "尼采"}]} 以上。')
+        assert data["entities"] == [{"name": "尼采"}]
+        assert "parse_error" not in data
+
+    def test_trailing_prose_with_brace(self):
+        data = self._parse('{"style": {}, "entities": []}\n注：集合记作 {a, b}。')
+        assert data["entities"] == []
+        assert "parse_error" not in data
+
+    def test_load_text_prefers_proofread(self, tmp_path):
+        from src.analyze import _load_text
+
+        (tmp_path / "pr").mkdir()
+        src = tmp_path / "ep1.json"
+        src.write_text(json.dumps({"title": "原", "transcription": "原文"}))
+        assert _load_text(src, True, tmp_path / "pr") == ("原文", "原")
+
+        pr = tmp_path / "pr" / "ep1.json"
+        pr.write_text(json.dumps({"title": "校", "transcription": "校对文"}))
+        assert _load_text(src, True, tmp_path / "pr") == ("校对文", "校")
+        assert _load_text(src, False, tmp_path / "pr") == ("原文", "原")
+
+    def test_unparseable_marks_error(self):
+        data = self._parse("抱歉，我无法完成。")
+        assert data["parse_error"] is True
+        assert data["title"] == "标题"
+
+
+class TestParseFeeds:
+    def test_results_keyed_by_podcast_id(self, monkeypatch):
+        from src.ingest import rss
+
+        def fake_parse_feed(pid, max_episodes=0):
+            return [_make_episode(episode_id=f"{pid}-1", title=pid)]
+
+        monkeypatch.setattr(rss, "parse_feed", fake_parse_feed)
+        feeds = rss.parse_feeds(["a", "b", "c"])
+        assert list(feeds) == ["a", "b", "c"]
+        assert feeds["b"][0].episode_id == "b-1"
+
+
+class TestLLMClient:
+    def test_reply_cached_until_forgotten(self, monkeypatch, tmp_path):
+        import httpx
+
+        from src import llm_cache, llm_client
+
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"choices": [{"message": {"content": "好"}}]})
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(llm_client, "get_client", lambda: client)
+        monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path)
+
+        llm = llm_client.LLMClient("http://proxy/v1", "key")
+        payload = {"model": "m", "messages": [{"role": "user", "content": "你好"}]}
+        assert llm.complete(payload) == "好"
+        assert llm.complete(payload) == "好"
+        assert len(calls) == 1
+        assert str(calls[0].url) == "http://proxy/v1/chat/completions"
+
+        llm.forget(payload)
+        llm.complete(payload)
+        assert len(calls) == 2
+
+    def test_truncated_proofread_not_cached(self, monkeypatch, tmp_path):
+        import httpx
+
+        from src import llm_cache, llm_client
+        from src.proofread import proofread_text
+
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            chunk = json.dumps({"choices": [{"delta": {"content": "改正后的文"}}]})
+            return httpx.Response(200, text=f"data: {chunk}\n\ndata: [DONE]\n\n")
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(llm_client, "get_client", lambda: client)
+        monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path)
+
+        with pytest.raises(ValueError, match="truncated"):
+            proofread_text("原文")
+        with pytest.raises(ValueError, match="truncated"):
+            proofread_text("原文")
+        assert len(calls) == 2
+
+
+class TestBudgetTokens:
+    def test_scales_with_input_between_floor_and_cap(self):
+        from src.llm_client import budget_tokens
+
+        assert budget_tokens("字" * 2000, 16384, per_char=1.2, overhead=500) == 8192
+        assert budget_tokens("字" * 10000, 16384, per_char=1.2, overhead=500) == 12500
+        assert budget_tokens("字" * 50000, 16384, per_char=1.2, overhead=500) == 16384
+
+
+class TestVadCandidates:
+    def _gate(self, frames):
+        pytest.importorskip("modal")
+        from src.slice.modal_slice import _vad_candidates
+
+        return _vad_candidates(frames)
+
+    def test_constant_level_keeps_every_frame(self):
+        np = pytest.importorskip("numpy")
+
+        frames = np.tile(np.array([3000, -3000], dtype=np.int16), (100, 240))
+        assert self._gate(frames).all()
+
+    def test_drops_quiet_frames_and_silence(self):
+        np = pytest.importorskip("numpy")
+
+        levels = np.array([0] * 20 + [50] * 30 + [3000] * 50, dtype=np.int16)
+        frames = np.repeat(levels[:, None], 480, axis=1)
+        mask = self._gate(frames)
+        assert not mask[:50].any()
+        assert mask[50:].all()